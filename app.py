@@ -14,6 +14,9 @@ import time
 import csv
 import io
 from datetime import datetime
+from scheduler import TIME_SLOTS, DAYS_OF_WEEK, get_time_slots_for_course, TeacherOccupancy, draw_seed
+from solvers import (SOLVER_BACKENDS, BuildingScheduler, ExactSolver, ResultCache, create_solver, load_solver_profiles,
+                     solve_cached)
 
 app = Flask(__name__)
 # Use environment variable for secret key, fallback to random for development
@@ -79,6 +82,42 @@ DAYS_PER_WEEK = 6  # Monday to Saturday
 LECTURE_DURATION_HOURS = 3
 LAB_DURATION_HOURS = 1
 
+# Fitness worker processes for the genetic algorithm (0 = evaluate in the request process)
+SCHEDULER_WORKERS = int(os.environ.get('SCHEDULER_WORKERS', '0'))
+# Island-model GA: sub-populations evolved in parallel processes (1 = single population)
+SCHEDULER_ISLANDS = int(os.environ.get('SCHEDULER_ISLANDS', '1'))
+# Default solver backend: 'genetic', 'annealing', 'tabu' or 'exact' (overridable per request with ?backend=)
+SCHEDULER_BACKEND = os.environ.get('SCHEDULER_BACKEND', 'genetic')
+# Floors with at most this many sections try the exact solver first (0 = never)
+SCHEDULER_EXACT_MAX_SECTIONS = int(os.environ.get('SCHEDULER_EXACT_MAX_SECTIONS', '300'))
+# Seconds the exact solver's backtracking search may spend before settling for its matching
+SCHEDULER_EXACT_TIME_LIMIT = float(os.environ.get('SCHEDULER_EXACT_TIME_LIMIT', '2'))
+# Whole-building solves: shift sub-problems solved at once (0 = one after another)
+SCHEDULER_BUILDING_PROCESSES = int(os.environ.get('SCHEDULER_BUILDING_PROCESSES', '2'))
+# Directory for solve checkpoints, so a solve cut short by a worker restart resumes (empty = off)
+SCHEDULER_CHECKPOINT_DIR = os.environ.get('SCHEDULER_CHECKPOINT_DIR', '')
+# Seconds between checkpoints
+SCHEDULER_CHECKPOINT_INTERVAL = float(os.environ.get('SCHEDULER_CHECKPOINT_INTERVAL', '30'))
+
+# Directory caching solved schedules, so an identical request is answered without solving again (empty = off)
+SCHEDULER_RESULT_CACHE_DIR = os.environ.get('SCHEDULER_RESULT_CACHE_DIR', '')
+# Cached results expire after this many hours; past the entry limit the oldest go first
+SCHEDULER_RESULT_CACHE_MAX_AGE_HOURS = float(os.environ.get('SCHEDULER_RESULT_CACHE_MAX_AGE_HOURS', '168'))
+SCHEDULER_RESULT_CACHE_MAX_ENTRIES = int(os.environ.get('SCHEDULER_RESULT_CACHE_MAX_ENTRIES', '100'))
+result_cache = ResultCache(SCHEDULER_RESULT_CACHE_DIR, max_age=SCHEDULER_RESULT_CACHE_MAX_AGE_HOURS * 3600,
+                           max_entries=SCHEDULER_RESULT_CACHE_MAX_ENTRIES) if SCHEDULER_RESULT_CACHE_DIR else None
+
+# Solver settings tuned per problem size by tune_solver.py (a missing file keeps the defaults)
+SCHEDULER_PROFILES = os.environ.get('SCHEDULER_PROFILES', 'solver_profiles.json')
+SOLVER_PROFILES = load_solver_profiles(SCHEDULER_PROFILES)
+
+def solver_checkpoint_path(name):
+    """Checkpoint file for the named solve, or None when checkpointing is off"""
+    if not SCHEDULER_CHECKPOINT_DIR:
+        return None
+    os.makedirs(SCHEDULER_CHECKPOINT_DIR, exist_ok=True)
+    return os.path.join(SCHEDULER_CHECKPOINT_DIR, f'{name}.ckpt')
+
 # Helper functions for floor management
 def extract_floor_number_from_room(room_number):
     """Extract floor number from room number (legacy support)"""
@@ -107,514 +146,6 @@ def calculate_floor_capacity(lecture_halls, labs):
         'total_capacity': lecture_capacity + lab_capacity
     }
 
-# Time slot configurations for scheduling
-TIME_SLOTS = {
-    'lecture': {
-        'morning': [
-            ('8:30 AM', '11:20 AM'),
-            ('11:30 AM', '2:20 PM'),
-            ('2:30 PM', '5:20 PM')
-        ],
-        'evening': [
-            ('5:00 PM', '7:50 PM')
-        ]
-    },
-    'lab': {
-        'morning': [
-            ('8:30 AM', '9:30 AM'), ('9:40 AM', '10:40 AM'), ('10:50 AM', '11:50 AM'),
-            ('12:00 PM', '1:00 PM'), ('1:10 PM', '2:10 PM'), ('2:20 PM', '3:20 PM'),
-            ('3:30 PM', '4:30 PM')
-        ],
-        'evening': [
-            ('5:00 PM', '6:00 PM'), ('6:10 PM', '7:10 PM'), ('7:20 PM', '8:20 PM'),
-            ('8:30 PM', '9:30 PM')
-        ]
-    }
-}
-
-DAYS_OF_WEEK = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday']
-
-def get_time_slots_for_course(course):
-    """Get appropriate time slots for a course based on type and shift"""
-    course_type = course.get('course_type', 'Lecture')
-    shift_field = course.get('shift', '')
-    section_code = course.get('section_code', '')
-
-    slot_type = 'lab' if course_type == 'Lab' else 'lecture'
-
-    # Determine shift from shift field or section_code
-    is_morning = shift_field == 'Morning' or section_code.startswith('MOR')
-    shift = 'morning' if is_morning else 'evening'
-
-    return TIME_SLOTS[slot_type][shift]
-
-# Genetic Algorithm for Timetable Scheduling
-import random
-import copy
-
-class TimetableScheduler:
-    def __init__(self, courses, rooms, floor_number):
-        self.courses = courses
-        self.rooms = rooms  # List of room dictionaries with room_number and type
-        self.floor_number = floor_number
-        self.population_size = 200
-        self.generations = 1000
-        self.mutation_rate = 0.15
-        self.crossover_rate = 0.85
-        self.elite_size = int(0.1 * self.population_size)
-        self.existing_schedules = []  # Will be set externally if needed
-
-    def create_chromosome(self):
-        """Create a random schedule (chromosome) with SMART sequential room filling"""
-        schedule = []
-        skipped_courses = []
-
-        # Track room usage: {room_number: [(day, time_slot), ...]}
-        lab_usage = {}
-        lecture_hall_usage = {}
-
-        # Separate courses by type for sequential processing
-        lab_courses = [c for c in self.courses if c.get('credit_hour') in ['1', 1]]
-        lecture_courses = [c for c in self.courses if c.get('credit_hour') in ['3', 3]]
-
-        # Get available rooms
-        labs = sorted([r for r in self.rooms if r.get('type') == 'Lab'],
-                     key=lambda r: r.get('room_number', 999))
-        lecture_halls = sorted([r for r in self.rooms if r.get('type') == 'Lecture Hall'],
-                              key=lambda r: r.get('room_number', 999))
-
-        # Initialize usage tracking
-        for lab in labs:
-            lab_usage[lab['room_number']] = []
-        for hall in lecture_halls:
-            lecture_hall_usage[hall['room_number']] = []
-
-        # PROCESS LABS FIRST (fill labs sequentially)
-        # Use SMART room-first filling: Fill Lab 1 completely before Lab 2
-        for course in lab_courses:
-            time_slots = get_time_slots_for_course(course)
-            if not time_slots:
-                skipped_courses.append(f"{course.get('course_name')} (no time slots)")
-                continue
-
-            if not labs:
-                skipped_courses.append(f"{course.get('course_name')} (no lab rooms available)")
-                continue
-
-            # Try to find a spot in existing labs (fill current labs completely first)
-            # Strategy: For each lab, try to fill days completely before moving to next day
-            placed = False
-            for lab in labs:
-                room_num = lab['room_number']
-
-                # For this lab, find which day has the most courses already
-                # (to fill that day completely before starting a new day)
-                day_usage_count = {}
-                for day in DAYS_OF_WEEK:
-                    count = sum(1 for (d, t) in lab_usage[room_num] if d == day)
-                    day_usage_count[day] = count
-
-                # Sort days: prioritize days that already have courses (fill those first)
-                # Then try empty days
-                days_sorted = sorted(DAYS_OF_WEEK, key=lambda d: day_usage_count.get(d, 0), reverse=True)
-
-                # Try to find an unused (day, time) slot in this lab
-                for day in days_sorted:
-                    for time_slot in time_slots:
-                        slot_key = (day, time_slot)
-                        if slot_key not in lab_usage[room_num]:
-                            # Found an empty slot! Use it
-                            lab_usage[room_num].append(slot_key)
-                            gene = {
-                                'course_id': str(course['_id']),
-                                'course_code': course.get('section_code', ''),
-                                'course_name': course.get('course_name', ''),
-                                'teacher_name': course.get('teacher_name', ''),
-                                'shift': course.get('shift', ''),
-                                'section_code': course.get('section_code', ''),
-                                'day': day,
-                                'time_slot': time_slot,
-                                'room': lab
-                            }
-                            schedule.append(gene)
-                            placed = True
-                            break
-                    if placed:
-                        break
-                if placed:
-                    break
-
-            # If couldn't place (all slots full), fall back to random
-            if not placed:
-                gene = {
-                    'course_id': str(course['_id']),
-                    'course_code': course.get('section_code', ''),
-                    'course_name': course.get('course_name', ''),
-                    'teacher_name': course.get('teacher_name', ''),
-                    'shift': course.get('shift', ''),
-                    'section_code': course.get('section_code', ''),
-                    'day': random.choice(DAYS_OF_WEEK),
-                    'time_slot': random.choice(time_slots),
-                    'room': random.choice(labs)
-                }
-                schedule.append(gene)
-
-        # PROCESS LECTURE HALLS (keep simple - don't change, focus is on labs)
-        for course in lecture_courses:
-            time_slots = get_time_slots_for_course(course)
-            if not time_slots:
-                skipped_courses.append(f"{course.get('course_name')} (no time slots)")
-                continue
-
-            if not lecture_halls:
-                skipped_courses.append(f"{course.get('course_name')} (no lecture halls available)")
-                continue
-
-            # Try to find a spot in existing halls first
-            placed = False
-            for hall in lecture_halls:
-                room_num = hall['room_number']
-
-                for day in DAYS_OF_WEEK:
-                    for time_slot in time_slots:
-                        slot_key = (day, time_slot)
-                        if slot_key not in lecture_hall_usage[room_num]:
-                            # Found an empty slot!
-                            lecture_hall_usage[room_num].append(slot_key)
-                            gene = {
-                                'course_id': str(course['_id']),
-                                'course_code': course.get('section_code', ''),
-                                'course_name': course.get('course_name', ''),
-                                'teacher_name': course.get('teacher_name', ''),
-                                'shift': course.get('shift', ''),
-                                'section_code': course.get('section_code', ''),
-                                'day': day,
-                                'time_slot': time_slot,
-                                'room': hall
-                            }
-                            schedule.append(gene)
-                            placed = True
-                            break
-                    if placed:
-                        break
-                if placed:
-                    break
-
-            # Fall back to random if couldn't place
-            if not placed:
-                gene = {
-                    'course_id': str(course['_id']),
-                    'course_code': course.get('section_code', ''),
-                    'course_name': course.get('course_name', ''),
-                    'teacher_name': course.get('teacher_name', ''),
-                    'shift': course.get('shift', ''),
-                    'section_code': course.get('section_code', ''),
-                    'day': random.choice(DAYS_OF_WEEK),
-                    'time_slot': random.choice(time_slots),
-                    'room': random.choice(lecture_halls)
-                }
-                schedule.append(gene)
-
-        # Log skipped courses on first chromosome creation
-        if skipped_courses and not hasattr(self, '_logged_skipped'):
-            self._logged_skipped = True
-            print(f"\n⚠️  WARNING: {len(skipped_courses)} courses skipped during chromosome creation:")
-            for skip in skipped_courses[:10]:  # Show first 10
-                print(f"    - {skip}")
-            if len(skipped_courses) > 10:
-                print(f"    ... and {len(skipped_courses) - 10} more")
-            print()
-
-        return schedule
-
-    def calculate_fitness(self, chromosome):
-        """Calculate fitness score for a schedule"""
-        # Start with base score proportional to courses scheduled
-        # This ensures partial solutions have positive fitness
-        score = len(chromosome) * 100  # 100 points per course scheduled
-
-        # Track conflicts
-        teacher_schedule = {}  # {(teacher, day, time): count}
-        room_schedule = {}  # {(room, day, time): count}
-        day_counts = {day: 0 for day in DAYS_OF_WEEK}
-
-        # Pre-populate with existing schedules to avoid conflicts
-        if self.existing_schedules:
-            for existing in self.existing_schedules:
-                teacher = existing.get('teacher_name')
-                day = existing.get('day')
-                start_time = existing.get('start_time')
-                end_time = existing.get('end_time')
-                room = existing.get('room_number')
-
-                # Mark these slots as occupied
-                time_slot = (start_time, end_time)
-                teacher_key = (teacher, day, time_slot)
-                room_key = (room, day, time_slot)
-
-                teacher_schedule[teacher_key] = 1
-                room_schedule[room_key] = 1
-
-        for gene in chromosome:
-            teacher = gene['teacher_name']
-            day = gene['day']
-            time_slot = gene['time_slot']
-            room = gene['room']['room_number']
-            room_type = gene['room'].get('type', '')
-            shift = gene.get('shift', '')
-            section_code = gene.get('section_code', '')
-            course_id = gene.get('course_id', '')
-
-            # Count classes per day
-            day_counts[day] += 1
-
-            # Check credit hour and room type matching (HARD CONSTRAINT)
-            # Find the course to get credit hours
-            course = next((c for c in self.courses if str(c['_id']) == course_id and c.get('section_code') == section_code), None)
-            if course:
-                credit_hour = course.get('credit_hour', '3')
-                # ENFORCE RULE: 3ch must be in Lecture Hall, 1ch must be in Lab
-                if (credit_hour == '3' or credit_hour == 3) and room_type != 'Lecture Hall':
-                    score -= 500  # High penalty but not fatal
-                elif (credit_hour == '1' or credit_hour == 1) and room_type != 'Lab':
-                    score -= 500  # High penalty but not fatal
-
-            # Check teacher conflicts (HARD CONSTRAINT)
-            teacher_key = (teacher, day, time_slot)
-            teacher_schedule[teacher_key] = teacher_schedule.get(teacher_key, 0) + 1
-            if teacher_schedule[teacher_key] > 1:
-                score -= 50  # Moderate penalty - allow evolution
-
-            # Check room conflicts (HARD CONSTRAINT)
-            room_key = (room, day, time_slot)
-            room_schedule[room_key] = room_schedule.get(room_key, 0) + 1
-            if room_schedule[room_key] > 1:
-                score -= 50  # Moderate penalty - allow evolution
-
-            # Check shift consistency (SOFT CONSTRAINT)
-            start_time = time_slot[0]
-            is_morning_slot = 'AM' in start_time and not start_time.startswith('5:')
-            is_morning_course = shift == 'Morning' or section_code.startswith('MOR')
-
-            if (is_morning_slot and not is_morning_course) or (not is_morning_slot and is_morning_course):
-                score -= 30  # Small penalty (reduced from 100)
-
-        # STRONG INCENTIVE for room concentration - fill rooms completely before using more
-        lecture_halls_used = set()
-        labs_used = set()
-        room_course_counts = {}  # Track courses per room
-
-        for g in chromosome:
-            room_num = g['room']['room_number']
-            room_type = g['room'].get('type', '')
-
-            if room_type == 'Lecture Hall':
-                lecture_halls_used.add(room_num)
-            elif room_type == 'Lab':
-                labs_used.add(room_num)
-
-            # Count courses per room
-            room_course_counts[room_num] = room_course_counts.get(room_num, 0) + 1
-
-        # PENALTY for using more rooms - but allow necessary rooms
-        # Small penalty for using additional rooms (encourage filling rooms but not aggressively)
-        lecture_halls_penalty = max(0, len(lecture_halls_used) - 1) * 5
-        labs_penalty = max(0, len(labs_used) - 1) * 5
-        total_room_penalty = lecture_halls_penalty + labs_penalty
-
-        score -= total_room_penalty
-
-        # Small bonus for using fewer rooms (but prioritize day filling over room minimization)
-        total_rooms_used = len(lecture_halls_used) + len(labs_used)
-
-        if total_rooms_used == 1:
-            score += 50  # Small reward for using only 1 room total
-        elif total_rooms_used == 2:
-            score += 30   # Small reward for using only 2 rooms
-        elif total_rooms_used == 3:
-            score += 15   # Small reward for 3 rooms
-        elif total_rooms_used <= 4:
-            score += 5   # Tiny reward for 4 rooms
-
-        # Additional bonus for balanced room filling (fill rooms evenly)
-        # Reward solutions where rooms have similar course counts
-        if len(room_course_counts) > 0:
-            avg_courses_per_room = sum(room_course_counts.values()) / len(room_course_counts)
-            # Reward if rooms are well-filled (close to average)
-            variance = sum(abs(count - avg_courses_per_room) for count in room_course_counts.values())
-            if variance < len(room_course_counts):  # Low variance = balanced
-                score += 100
-
-        # Reward balanced day distribution (very reduced weight to prioritize room minimization above all)
-        avg_per_day = len(chromosome) / len(DAYS_OF_WEEK) if len(DAYS_OF_WEEK) > 0 else 0
-        balance_penalty = sum(abs(count - avg_per_day) for count in day_counts.values())
-        score -= balance_penalty * 2  # Reduced from 5 to 2 - room minimization is top priority
-
-        # Bonus for scheduling all courses
-        if len(chromosome) == len(self.courses):
-            score += 500
-
-        return max(score, 0)  # Ensure non-negative
-
-    def crossover(self, parent1, parent2):
-        """Combine two schedules to create offspring"""
-        if random.random() > self.crossover_rate:
-            return copy.deepcopy(parent1)
-
-        # Handle edge cases where parents are too small
-        min_len = min(len(parent1), len(parent2))
-        if min_len <= 1:
-            # If parents are too small, just return a copy of parent1
-            return copy.deepcopy(parent1)
-
-        # Single-point crossover
-        point = random.randint(1, min_len - 1)
-        child = parent1[:point] + parent2[point:]
-
-        # Remove duplicate courses by checking both course_id and section_code
-        seen = set()
-        unique_child = []
-        for gene in child:
-            class_identifier = (gene['course_id'], gene['section_code'])
-            if class_identifier not in seen:
-                seen.add(class_identifier)
-                unique_child.append(gene)
-
-        return unique_child
-
-    def mutate(self, chromosome):
-        """Randomly modify a schedule"""
-        if random.random() > self.mutation_rate:
-            return chromosome
-
-        mutated = copy.deepcopy(chromosome)
-
-        if not mutated:
-            return mutated
-
-        # Pick random gene to mutate
-        gene = random.choice(mutated)
-
-        # Randomly mutate day, time, or room
-        mutation_type = random.choice(['day', 'time', 'room'])
-
-        if mutation_type == 'day':
-            gene['day'] = random.choice(DAYS_OF_WEEK)
-        elif mutation_type == 'time':
-            course = next((c for c in self.courses if str(c['_id']) == gene['course_id'] and c['section_code'] == gene['section_code']), None)
-            if course:
-                time_slots = get_time_slots_for_course(course)
-                gene['time_slot'] = random.choice(time_slots)
-        elif mutation_type == 'room':
-            course = next((c for c in self.courses if str(c['_id']) == gene['course_id'] and c['section_code'] == gene['section_code']), None)
-            if course:
-                credit_hour = course.get('credit_hour', '3')
-                course_type = course.get('course_type', 'Lecture')
-
-                # ENFORCE RULE: 3ch must be in Lecture Hall, 1ch must be in Lab
-                if credit_hour == '3' or credit_hour == 3:
-                    valid_rooms = [r for r in self.rooms if r.get('type') == 'Lecture Hall']
-                elif credit_hour == '1' or credit_hour == 1:
-                    valid_rooms = [r for r in self.rooms if r.get('type') == 'Lab']
-                else:
-                    # Fallback to old logic
-                    valid_rooms = [r for r in self.rooms if r.get('type') == ('Lab' if course_type == 'Lab' else 'Lecture Hall')]
-
-                if valid_rooms:
-                    # Apply VERY STRONG room concentration bias during mutation (same as creation)
-                    valid_rooms_sorted = sorted(valid_rooms, key=lambda r: r.get('room_number', 999))
-
-                    # 95% chance to use FIRST room only during mutation
-                    if len(valid_rooms_sorted) >= 1 and random.random() < 0.95:
-                        gene['room'] = valid_rooms_sorted[0]
-                    else:
-                        gene['room'] = random.choice(valid_rooms_sorted)
-
-        return mutated
-
-    def evolve(self):
-        """Run the genetic algorithm"""
-        # Initialize population
-        print(f"Creating initial population of {self.population_size} chromosomes...")
-        population = [self.create_chromosome() for _ in range(self.population_size)]
-
-        # Debug: Check first chromosome
-        if population and len(population) > 0:
-            print(f"First chromosome has {len(population[0])} genes (courses scheduled)")
-            if len(population[0]) == 0:
-                print("❌ ERROR: Chromosomes are empty! No courses being added to schedule.")
-                return None, 0
-            elif len(population[0]) < len(self.courses):
-                print(f"⚠️  WARNING: Only {len(population[0])}/{len(self.courses)} courses in chromosome")
-
-        best_fitness = 0
-        best_schedule = None
-        generations_without_improvement = 0
-        max_stagnant_generations = 100  # Early termination if no improvement
-
-        for generation in range(self.generations):
-            # Evaluate fitness
-            fitness_scores = [(chromo, self.calculate_fitness(chromo)) for chromo in population]
-            fitness_scores.sort(key=lambda x: x[1], reverse=True)
-
-            # Debug first generation
-            if generation == 0:
-                print(f"\nFirst generation fitness scores:")
-                print(f"  Best: {fitness_scores[0][1]}")
-                print(f"  Worst: {fitness_scores[-1][1]}")
-                print(f"  Average: {sum(f for _, f in fitness_scores) / len(fitness_scores):.1f}")
-                if fitness_scores[0][1] <= 0:
-                    print(f"  ❌ All fitness scores are ≤ 0! Severe penalties detected.")
-                print()
-
-            # Track best
-            current_best_fitness = fitness_scores[0][1]
-            if current_best_fitness > best_fitness:
-                best_fitness = current_best_fitness
-                best_schedule = copy.deepcopy(fitness_scores[0][0])
-                generations_without_improvement = 0
-                print(f"Generation {generation}: Best fitness = {best_fitness}")
-            else:
-                generations_without_improvement += 1
-
-            # Check for perfect solution (no conflicts)
-            # Perfect = all courses scheduled with no penalties
-            # With new scoring: len(courses) * 100 - small penalties
-            expected_perfect_score = len(self.courses) * 100
-            if best_fitness >= expected_perfect_score * 0.95:  # Allow small penalties
-                print(f"✓ Near-perfect solution found at generation {generation}!")
-                break
-
-            # Early termination if stuck
-            if generations_without_improvement >= max_stagnant_generations:
-                print(f"Early termination at generation {generation}: No improvement for {max_stagnant_generations} generations")
-                break
-
-            # If fitness is very low relative to courses, likely impossible
-            if generation > 50 and best_fitness < len(self.courses) * 20:
-                print(f"Early termination at generation {generation}: Fitness too low ({best_fitness}), likely impossible scenario")
-                break
-
-            # Selection: Keep elite
-            new_population = [chromo for chromo, _ in fitness_scores[:self.elite_size]]
-
-            # Crossover and mutation
-            while len(new_population) < self.population_size:
-                # Tournament selection
-                parent1 = random.choice(fitness_scores[:50])[0]
-                parent2 = random.choice(fitness_scores[:50])[0]
-
-                child = self.crossover(parent1, parent2)
-
-
-                child = self.mutate(child)
-
-                new_population.append(child)
-
-            population = new_population
-
-        return best_schedule, best_fitness
-
 # Function to generate random password
 def generate_password(length=10):
     """Generate a random password with letters, digits, and special characters"""
@@ -975,27 +506,11 @@ def autogenerate_configure():
         capacity=capacity_info
     )
 
-@app.route("/autogenerate_autopick")
-@login_required
-def autogenerate_autopick():
-    """Automatically pick unscheduled courses based on floor capacity"""
-    floor_number = request.args.get('floor', type=int)
-    if not floor_number:
-        return redirect(url_for('autogenerate_select_floor'))
-
-    # Get all rooms and filter by floor number (extracted from room_number)
-    all_rooms = list(rooms_collection.find({}))
-    floor_rooms = []
-
-    for room in all_rooms:
-        room_floor = extract_floor_number_from_room(room.get('room_number', ''))
-        if room_floor and room_floor.isdigit() and int(room_floor) == floor_number:
-            floor_rooms.append(room)
-
-    # Count rooms by type
-    lecture_halls = sum(1 for room in floor_rooms if room.get('type') == 'Lecture Hall')
-    labs = sum(1 for room in floor_rooms if room.get('type') == 'Lab')
+def get_unscheduled_schedulable_units():
+    """One schedulable unit per course section not scheduled on any floor yet
 
+    Returns (units, total sections in the database).
+    """
     # Get ALL already scheduled sections from all floors
     all_scheduled_classes = list(scheduled_classes_collection.find({}))
     scheduled_sections_set = set()
@@ -1005,9 +520,6 @@ def autogenerate_autopick():
         if course_id and section_code:
             scheduled_sections_set.add((str(course_id), section_code))
 
-    print(f"\n{'='*60}")
-    print(f"AUTOPICK FOR FLOOR {floor_number}")
-    print(f"{'='*60}")
     print(f"Total scheduled sections across all floors: {len(scheduled_sections_set)}")
 
     # Prepare a list of all schedulable units (course sections that are not yet scheduled)
@@ -1030,6 +542,68 @@ def autogenerate_autopick():
                 schedulable_unit['section_code'] = section_code # Ensure this unit represents this specific section
                 all_schedulable_units.append(schedulable_unit)
 
+    return all_schedulable_units, total_sections_in_db
+
+def build_scheduled_class(gene, course, floor_number):
+    """scheduled_classes document for a solver gene of the given course"""
+    return {
+        'course_id': ObjectId(gene['course_id']),
+        'course_name': gene['course_name'],
+        'section_code': gene['section_code'],
+        'teacher_registration': course.get('teacher_registration'),
+        'teacher_name': gene['teacher_name'],
+        'course_type': course.get('course_type'),
+        'credit_hour': course.get('credit_hour'),
+        'shift': course.get('shift'),
+        'floor': floor_number,
+        'room_number': int(gene['room']['room_number']),
+        'day': gene['day'],
+        'start_time': gene['time_slot'][0],
+        'end_time': gene['time_slot'][1]
+    }
+
+def preserved_classes(query):
+    """scheduled_classes matching query, with room_number as the string the room documents use"""
+    classes = list(scheduled_classes_collection.find(query))
+    for scheduled_class in classes:
+        if scheduled_class.get('room_number') is not None:
+            scheduled_class['room_number'] = str(scheduled_class['room_number'])
+    return classes
+
+@app.route("/autogenerate_autopick")
+@login_required
+def autogenerate_autopick():
+    """Automatically pick unscheduled courses based on floor capacity"""
+    floor_number = request.args.get('floor', type=int)
+    if not floor_number:
+        return redirect(url_for('autogenerate_select_floor'))
+
+    # Seeded picks, so the same ?seed= picks the same sections again
+    seed = request.args.get('seed', type=int)
+    if seed is None:
+        seed = draw_seed()
+    rng = random.Random(seed)
+
+    # Get all rooms and filter by floor number (extracted from room_number)
+    all_rooms = list(rooms_collection.find({}))
+    floor_rooms = []
+
+    for room in all_rooms:
+        room_floor = extract_floor_number_from_room(room.get('room_number', ''))
+        if room_floor and room_floor.isdigit() and int(room_floor) == floor_number:
+            floor_rooms.append(room)
+
+    # Count rooms by type
+    lecture_halls = sum(1 for room in floor_rooms if room.get('type') == 'Lecture Hall')
+    labs = sum(1 for room in floor_rooms if room.get('type') == 'Lab')
+
+    print(f"\n{'='*60}")
+    print(f"AUTOPICK FOR FLOOR {floor_number}")
+    print(f"Seed: {seed}")
+    print(f"{'='*60}")
+
+    all_schedulable_units, total_sections_in_db = get_unscheduled_schedulable_units()
+
     print(f"Total course sections in database: {total_sections_in_db}")
     print(f"Available unscheduled sections: {len(all_schedulable_units)}")
     print(f"{'='*60}\n")
@@ -1115,10 +689,10 @@ def autogenerate_autopick():
     print()
 
     # Randomly shuffle the lists to ensure fairness in selection up to capacity
-    random.shuffle(unscheduled_lectures_morning)
-    random.shuffle(unscheduled_lectures_evening)
-    random.shuffle(unscheduled_labs_morning)
-    random.shuffle(unscheduled_labs_evening)
+    rng.shuffle(unscheduled_lectures_morning)
+    rng.shuffle(unscheduled_lectures_evening)
+    rng.shuffle(unscheduled_labs_morning)
+    rng.shuffle(unscheduled_labs_evening)
 
     # Pick units based on shift-specific capacity
     selected_lectures_morning = unscheduled_lectures_morning[:morning_lecture_capacity]
@@ -1159,7 +733,8 @@ def autogenerate_autopick():
         'total_selected': total_selected,
         'floor_number': floor_number,
         'lecture_halls': lecture_halls,
-        'labs': labs
+        'labs': labs,
+        'seed': seed
     }
 
     # Redirect to confirmation/scheduling page
@@ -1379,12 +954,19 @@ def autogenerate_submit_manual_pick():
 @app.route("/execute_autogenerate_scheduling")
 @login_required
 def execute_autogenerate_scheduling():
-    """Execute the genetic algorithm and create the timetable"""
+    """Run the selected solver backend and create the timetable"""
     floor_number = request.args.get('floor', type=int)
+    backend = request.args.get('backend', SCHEDULER_BACKEND)
+    requested_seed = request.args.get('seed', type=int)  # Reproduce a run with its seed
+    seed = requested_seed if requested_seed is not None else draw_seed()
+    force = request.args.get('force') == '1'  # Solve again even if an identical solve is cached
 
     if not floor_number or 'autopicked_sections' not in session: # Check new session key
         return redirect(url_for('autogenerate_select_floor'))
 
+    if backend not in SOLVER_BACKENDS:
+        return jsonify({'success': False, 'error': f"Unknown solver backend '{backend}'. Choose from: {', '.join(SOLVER_BACKENDS)}"}), 400
+
     try:
         # Get selected sections (course_id, section_code) from session
         selected_sections_from_session = session.get('autopicked_sections', [])
@@ -1427,8 +1009,10 @@ def execute_autogenerate_scheduling():
         print(f"Floor rooms found: {len(floor_rooms)}")
 
         print(f"\n{'='*60}")
-        print(f"STARTING GENETIC ALGORITHM SCHEDULING")
+        print(f"STARTING AUTOMATIC SCHEDULING")
         print(f"Floor: {floor_number}")
+        print(f"Solver backend: {backend}")
+        print(f"Seed: {seed}")
         print(f"Courses to schedule: {len(selected_schedulable_units)}")
         print(f"Available rooms: {len(floor_rooms)}")
 
@@ -1479,39 +1063,73 @@ def execute_autogenerate_scheduling():
         autogenerate_mode = session.get('autogenerate_mode', 'replace')
         if autogenerate_mode == 'add':
             # Get existing schedules on this floor to avoid conflicts
-            existing_schedules = list(scheduled_classes_collection.find({'floor': floor_number}))
+            existing_schedules = preserved_classes({'floor': floor_number})
             print(f"Existing classes to preserve: {len(existing_schedules)}")
         else:
             existing_schedules = []
 
+        # Teachers' classes on the other floors are fixed blocked time for this solve
+        teacher_occupancy = TeacherOccupancy(scheduled_classes_collection.find({}, TeacherOccupancy.PROJECTION))
+        teacher_busy = teacher_occupancy.busy_minutes(
+            {c.get('teacher_name') for c in selected_schedulable_units}, exclude_floor=floor_number
+        )
+        print(f"Teachers already teaching on other floors: {len({teacher for teacher, _ in teacher_busy})}")
+
         print(f"{'='*60}\n")
 
-        # Run genetic algorithm
+        # Run the solver
         try:
-            scheduler = TimetableScheduler(selected_schedulable_units, floor_rooms, floor_number)
-
-            # Pass existing schedules if in "add mode"
-            if existing_schedules:
-                scheduler.existing_schedules = existing_schedules
+            best_schedule = None
+
+            # Small floors: look for a provably conflict-free timetable first
+            if backend != 'exact' and len(selected_schedulable_units) <= SCHEDULER_EXACT_MAX_SECTIONS:
+                exact_solver = ExactSolver(selected_schedulable_units, floor_rooms, floor_number)
+                exact_solver.time_limit = SCHEDULER_EXACT_TIME_LIMIT
+                exact_solver.seed = seed
+                exact_solver.existing_schedules = existing_schedules
+                exact_solver.teacher_busy = teacher_busy
+                best_schedule, fitness_score = exact_solver.solve()
+                if exact_solver.status == 'infeasible':
+                    print(f"No conflict-free timetable exists, falling back to the {backend} solver")
+                elif best_schedule is None:
+                    print(f"Exact solver stopped with status '{exact_solver.status}' "
+                          f"(time limit {SCHEDULER_EXACT_TIME_LIMIT}s), falling back to the {backend} solver")
 
-            best_schedule, fitness_score = scheduler.evolve()
+            if best_schedule is None:
+                scheduler = create_solver(backend, selected_schedulable_units, floor_rooms, floor_number, SOLVER_PROFILES)
+                scheduler.workers = SCHEDULER_WORKERS
+                scheduler.islands = SCHEDULER_ISLANDS
+                scheduler.teacher_busy = teacher_busy
+                scheduler.seed = seed
+                scheduler.checkpoint_path = solver_checkpoint_path(f'floor-{floor_number}')
+                scheduler.checkpoint_interval = SCHEDULER_CHECKPOINT_INTERVAL
+
+                # Pass existing schedules if in "add mode"
+                if existing_schedules:
+                    scheduler.existing_schedules = existing_schedules
+
+                best_schedule, fitness_score = solve_cached(scheduler, result_cache, requested_seed, force)
+                seed = scheduler.stats.get('seed', seed)  # A cached result keeps the seed it was solved with
+                phase_times = scheduler.stats.get('phase_times')
+                if phase_times:
+                    print("Time per phase: " + ", ".join(f"{phase} {seconds:.2f}s" for phase, seconds in phase_times.items()))
 
             # Check if scheduling failed (returned None)
             if best_schedule is None:
-                error_msg = f"Genetic algorithm failed to generate a valid schedule. Final fitness: {fitness_score}. "
+                error_msg = f"The {backend} solver failed to generate a valid schedule. Final fitness: {fitness_score}. "
                 error_msg += f"This usually means there are too many courses ({len(selected_schedulable_units)}) for the available rooms ({len(floor_rooms)}) on Floor {floor_number}."
                 print(f"\n❌ {error_msg}")
                 return jsonify({'success': False, 'error': error_msg}), 500
 
         except Exception as ga_error:
-            print(f"ERROR in genetic algorithm: {str(ga_error)}")
+            print(f"ERROR in {backend} solver: {str(ga_error)}")
             import traceback
             traceback.print_exc()
             return jsonify({'success': False, 'error': f'Scheduling failed: {str(ga_error)}'}), 500
 
         print(f"\n{'='*60}")
         print(f"SCHEDULING COMPLETE")
-        print(f"Final fitness score: {fitness_score}")
+        print(f"Final fitness score: {fitness_score} (seed {seed})")
         print(f"Courses scheduled: {len(best_schedule)}/{len(selected_schedulable_units)}")
 
         # Calculate and display room utilization
@@ -1551,21 +1169,7 @@ def execute_autogenerate_scheduling():
                 print(f"Warning: could not find original course for gene {gene}")
                 continue
                 
-            scheduled_class = {
-                'course_id': ObjectId(gene['course_id']),
-                'course_name': gene['course_name'],
-                'section_code': gene['section_code'],
-                'teacher_registration': original_course_for_db.get('teacher_registration'),
-                'teacher_name': gene['teacher_name'],
-                'course_type': original_course_for_db.get('course_type'),
-                'credit_hour': original_course_for_db.get('credit_hour'),
-                'shift': original_course_for_db.get('shift'),
-                'floor': floor_number,
-                'room_number': int(gene['room']['room_number']),
-                'day': gene['day'],
-                'start_time': gene['time_slot'][0],
-                'end_time': gene['time_slot'][1]
-            }
+            scheduled_class = build_scheduled_class(gene, original_course_for_db, floor_number)
             scheduled_classes_collection.insert_one(scheduled_class)
             scheduled_count += 1
 
@@ -1578,7 +1182,7 @@ def execute_autogenerate_scheduling():
 
         # Redirect to timetable view
         return redirect(url_for('view_autogenerated_timetable', floor=floor_number,
-                               scheduled=scheduled_count, total=len(selected_schedulable_units)))
+                               scheduled=scheduled_count, total=len(selected_schedulable_units), seed=seed))
 
     except Exception as e:
         print(f"Error during scheduling: {str(e)}")
@@ -1586,6 +1190,99 @@ def execute_autogenerate_scheduling():
         traceback.print_exc()
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@app.route("/autogenerate_building", methods=["POST"])
+@login_required
+def autogenerate_building():
+    """Schedule every unscheduled section across all floors in one solve
+
+    Floor is just a room attribute here, so teacher clashes between floors are
+    optimized globally. Classes already scheduled are preserved.
+    """
+    backend = request.args.get('backend', SCHEDULER_BACKEND)
+    requested_seed = request.args.get('seed', type=int)  # Reproduce a run with its seed
+    seed = requested_seed if requested_seed is not None else draw_seed()
+    force = request.args.get('force') == '1'  # Solve again even if an identical solve is cached
+    if backend not in SOLVER_BACKENDS:
+        return jsonify({'success': False, 'error': f"Unknown solver backend '{backend}'. Choose from: {', '.join(SOLVER_BACKENDS)}"}), 400
+
+    try:
+        print(f"\n{'='*60}")
+        print(f"WHOLE-BUILDING SCHEDULING")
+        print(f"{'='*60}")
+
+        selected_schedulable_units, total_sections_in_db = get_unscheduled_schedulable_units()
+        if not selected_schedulable_units:
+            return jsonify({'success': False, 'error': 'Every course section is already scheduled'}), 400
+
+        # Every room with a floor, the floor kept as a room attribute
+        building_rooms = []
+        for room in rooms_collection.find({}):
+            room_floor = extract_floor_number_from_room(room.get('room_number', ''))
+            if room_floor and room_floor.isdigit():
+                room['floor'] = int(room_floor)
+                building_rooms.append(room)
+
+        if not building_rooms:
+            return jsonify({'success': False, 'error': 'No rooms found'}), 400
+
+        existing_schedules = preserved_classes({})
+
+        print(f"Solver backend: {backend}")
+        print(f"Seed: {seed}")
+        print(f"Courses to schedule: {len(selected_schedulable_units)}/{total_sections_in_db}")
+        print(f"Available rooms: {len(building_rooms)} on {len({r['floor'] for r in building_rooms})} floors")
+        print(f"Existing classes to preserve: {len(existing_schedules)}")
+        print(f"{'='*60}\n")
+
+        scheduler = BuildingScheduler(selected_schedulable_units, building_rooms, backend=backend)
+        scheduler.processes = SCHEDULER_BUILDING_PROCESSES
+        scheduler.profiles = SOLVER_PROFILES
+        scheduler.existing_schedules = existing_schedules
+        scheduler.seed = seed
+        scheduler.checkpoint_path = solver_checkpoint_path('building')
+        scheduler.checkpoint_interval = SCHEDULER_CHECKPOINT_INTERVAL
+        best_schedule, fitness_score = solve_cached(scheduler, result_cache, requested_seed, force)
+        seed = scheduler.stats.get('seed', seed)  # A cached result keeps the seed it was solved with
+
+        if best_schedule is None:
+            error_msg = f"Failed to generate a building-wide schedule. Final fitness: {fitness_score}."
+            print(f"\n❌ {error_msg}")
+            return jsonify({'success': False, 'error': error_msg}), 500
+
+        db_courses_map = {str(c['_id']): c for c in selected_schedulable_units}
+        scheduled_classes = []
+        floor_counts = {}
+        for gene in best_schedule:
+            floor_number = gene['room']['floor']
+            scheduled_classes.append(build_scheduled_class(gene, db_courses_map[gene['course_id']], floor_number))
+            floor_counts[floor_number] = floor_counts.get(floor_number, 0) + 1
+
+        if scheduled_classes:
+            scheduled_classes_collection.insert_many(scheduled_classes)
+
+        print(f"\n{'='*60}")
+        print(f"BUILDING SCHEDULING COMPLETE")
+        print(f"Final fitness score: {fitness_score}")
+        for floor_number in sorted(floor_counts):
+            print(f"  Floor {floor_number}: {floor_counts[floor_number]} classes")
+        print(f"✓ Saved {len(scheduled_classes)} classes to database")
+        print(f"{'='*60}\n")
+
+        return jsonify({
+            'success': True,
+            'scheduled': len(scheduled_classes),
+            'total': len(selected_schedulable_units),
+            'fitness': fitness_score,
+            'seed': seed,
+            'floors': {str(floor_number): count for floor_number, count in sorted(floor_counts.items())}
+        })
+
+    except Exception as e:
+        print(f"Error during building scheduling: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 @app.route("/view_autogenerated_timetable")
 @login_required
 def view_autogenerated_timetable():
@@ -1676,6 +1373,147 @@ def regenerate_floor():
     # Redirect to course selection page (autopick or manual pick)
     return redirect(url_for('autogenerate_configure', floor=floor_number))
 
+@app.route("/reschedule_floor", methods=["POST"])
+@login_required
+def reschedule_floor():
+    """Re-optimize a floor around its current timetable (minimal perturbation)
+
+    The floor's sections, plus new unscheduled sections of the same courses, are
+    solved warm-started from the current placements with a penalty for every
+    class that moves. A few changed sections (a new section, a reassigned
+    teacher) then only disturb the classes around them. Classes whose course
+    or section no longer exists, and sections the solve could not place, keep
+    their current class.
+    """
+    floor_number = request.form.get('floor', type=int)
+    backend = request.form.get('backend', SCHEDULER_BACKEND)
+    requested_seed = request.form.get('seed', type=int)  # Reproduce a run with its seed
+    seed = requested_seed if requested_seed is not None else draw_seed()
+    force = request.form.get('force') == '1'  # Solve again even if an identical solve is cached
+
+    if not floor_number:
+        return redirect(url_for('autogenerate_select_floor'))
+
+    # The exact solver looks for any conflict-free timetable and ignores the move penalty
+    warm_backends = [name for name in SOLVER_BACKENDS if name != 'exact']
+    if backend not in warm_backends:
+        return jsonify({'success': False, 'error': f"Unknown solver backend '{backend}'. Choose from: {', '.join(warm_backends)}"}), 400
+
+    try:
+        print(f"\n{'='*60}")
+        print(f"RESCHEDULING FLOOR {floor_number} (MINIMAL PERTURBATION)")
+        print(f"{'='*60}")
+
+        previous_schedule = list(scheduled_classes_collection.find({'floor': floor_number}))
+        if not previous_schedule:
+            return jsonify({'success': False, 'error': f'Floor {floor_number} has no timetable to reschedule'}), 400
+
+        # Sections scheduled on other floors stay there
+        sections_elsewhere = {
+            (str(sc.get('course_id')), sc.get('section_code'))
+            for sc in scheduled_classes_collection.find({'floor': {'$ne': floor_number}}, {'course_id': 1, 'section_code': 1})
+        }
+        course_ids = {sc.get('course_id') for sc in previous_schedule if sc.get('course_id')}
+        db_courses_map = {str(c['_id']): c for c in courses_collection.find({'_id': {'$in': list(course_ids)}})}
+
+        selected_schedulable_units = []
+        for course_id_str, course in db_courses_map.items():
+            # Handle both old (section_code) and new (section_codes) format
+            sections_in_course = course.get('section_codes', [])
+            if not sections_in_course and course.get('section_code'):
+                sections_in_course = [course.get('section_code')]
+            for section_code in sections_in_course:
+                if (course_id_str, section_code) not in sections_elsewhere:
+                    schedulable_unit = course.copy()
+                    schedulable_unit['section_code'] = section_code
+                    selected_schedulable_units.append(schedulable_unit)
+
+        if not selected_schedulable_units:
+            return jsonify({'success': False, 'error': 'No course sections left to schedule on this floor'}), 400
+
+        unit_keys = {(str(unit['_id']), unit['section_code']) for unit in selected_schedulable_units}
+        orphaned_classes = [sc for sc in previous_schedule
+                            if (str(sc.get('course_id')), sc.get('section_code')) not in unit_keys]
+
+        all_rooms = list(rooms_collection.find({}))
+        floor_rooms = []
+        for room in all_rooms:
+            room_floor = extract_floor_number_from_room(room.get('room_number', ''))
+            if room_floor and room_floor.isdigit() and int(room_floor) == floor_number:
+                floor_rooms.append(room)
+
+        if not floor_rooms:
+            return jsonify({'success': False, 'error': 'No rooms found on this floor'}), 400
+
+        teacher_occupancy = TeacherOccupancy(scheduled_classes_collection.find({}, TeacherOccupancy.PROJECTION))
+        teacher_busy = teacher_occupancy.busy_minutes(
+            {c.get('teacher_name') for c in selected_schedulable_units}, exclude_floor=floor_number
+        )
+
+        print(f"Solver backend: {backend}")
+        print(f"Seed: {seed}")
+        print(f"Current classes: {len(previous_schedule)}")
+        print(f"Sections to place: {len(selected_schedulable_units)}")
+        print(f"Classes kept without a course section: {len(orphaned_classes)}")
+        print(f"{'='*60}\n")
+
+        scheduler = create_solver(backend, selected_schedulable_units, floor_rooms, floor_number, SOLVER_PROFILES)
+        scheduler.workers = SCHEDULER_WORKERS
+        scheduler.islands = SCHEDULER_ISLANDS
+        scheduler.teacher_busy = teacher_busy
+        scheduler.previous_schedule = previous_schedule
+        if orphaned_classes:
+            # Classes whose course or section is gone stay where they are, like add mode's preserved classes
+            scheduler.existing_schedules = [dict(sc, room_number=str(sc.get('room_number'))) for sc in orphaned_classes]
+        scheduler.seed = seed
+        scheduler.checkpoint_path = solver_checkpoint_path(f'reschedule-floor-{floor_number}')
+        scheduler.checkpoint_interval = SCHEDULER_CHECKPOINT_INTERVAL
+        best_schedule, fitness_score = solve_cached(scheduler, result_cache, requested_seed, force)
+        seed = scheduler.stats.get('seed', seed)  # A cached result keeps the seed it was solved with
+
+        if best_schedule is None:
+            error_msg = f"Failed to reschedule floor {floor_number}. Final fitness: {fitness_score}."
+            print(f"\n❌ {error_msg}")
+            return jsonify({'success': False, 'error': error_msg}), 500
+
+        previous_placements = scheduler.previous_placements()
+        moved_count = sum(
+            1 for gene in best_schedule
+            if previous_placements.get((gene['course_id'], gene['section_code']))
+            not in (None, (gene['day'], gene['time_slot'], str(gene['room']['room_number'])))
+        )
+        new_count = sum(1 for gene in best_schedule
+                        if (gene['course_id'], gene['section_code']) not in previous_placements)
+
+        scheduled_classes = [build_scheduled_class(gene, db_courses_map[gene['course_id']], floor_number)
+                             for gene in best_schedule]
+        # Only replace classes the solve placed again; orphaned and unplaced sections keep theirs
+        placed_sections = {(gene['course_id'], gene['section_code']) for gene in best_schedule}
+        kept_classes = [sc for sc in previous_schedule
+                        if (str(sc.get('course_id')), sc.get('section_code')) not in placed_sections]
+        result = scheduled_classes_collection.delete_many(
+            {'floor': floor_number, '_id': {'$nin': [sc['_id'] for sc in kept_classes]}})
+        scheduled_classes_collection.insert_many(scheduled_classes)
+
+        print(f"\n{'='*60}")
+        print(f"RESCHEDULING COMPLETE")
+        print(f"Final fitness score: {fitness_score}")
+        print(f"Classes moved: {moved_count}, newly placed: {new_count}, replaced: {result.deleted_count}")
+        print(f"✓ Saved {len(scheduled_classes)} classes to database")
+        for sc in kept_classes:
+            print(f"  kept {sc.get('course_name')} ({sc.get('section_code')}): {sc.get('day')} "
+                  f"{sc.get('start_time')}-{sc.get('end_time')} in room {sc.get('room_number')}")
+        print(f"{'='*60}\n")
+
+        return redirect(url_for('view_autogenerated_timetable', floor=floor_number,
+                               scheduled=len(scheduled_classes), total=len(selected_schedulable_units), seed=seed))
+
+    except Exception as e:
+        print(f"Error during rescheduling: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 @app.route("/autogenerate_all_three")
 @login_required
 def autogenerate_all_three():
@@ -0,0 +1,376 @@
+"""Synthetic-institution benchmark for the scheduling engine (no MongoDB needed)
+
+Generates course, room and teacher sets shaped like the documents the routes
+pass to the solvers, runs solver configurations on them and prints one JSON
+report, so runs can be compared over time:
+
+    python benchmark.py --suite quick
+    python benchmark.py --floors 5 --sections 500 --solvers genetic,tabu,building:tabu --repeat 3
+    python benchmark.py --suite standard --set generations=300 --output results.json
+
+Each run happens in a fresh process, so its peak memory (peak RSS of that
+process, solver pools not included) is not inflated by earlier runs.
+Rooms are sized to the generated sections unless given; a scenario no
+conflict-free timetable can exist for is reported with infeasible_by_capacity.
+"""
+import argparse
+import ast
+import contextlib
+import json
+import math
+import multiprocessing
+import platform
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+try:
+    import resource
+except ImportError:  # Windows: peak memory is reported as None
+    resource = None
+
+from scheduler import DAYS_OF_WEEK, TIME_SLOTS, ProblemEncoding, FitnessState, time_slot_interval
+from solvers import SOLVER_BACKENDS, BuildingScheduler, ExactSolver, create_solver
+
+# Named scenario sets; every scenario is a set of generate_institution() arguments
+SUITES = {
+    'quick': [
+        {'name': '1-floor-50', 'floors': 1, 'sections': 50},
+        {'name': '1-floor-200', 'floors': 1, 'sections': 200},
+    ],
+    'standard': [
+        {'name': '1-floor-200', 'floors': 1, 'sections': 200},
+        {'name': '5-floors-500', 'floors': 5, 'sections': 500},
+        {'name': '5-floors-1000-evening-heavy', 'floors': 5, 'sections': 1000, 'morning_share': 0.3},
+        {'name': '5-floors-1000-heavy-load', 'floors': 5, 'sections': 1000, 'teacher_load': 8.0},
+    ],
+    'large': [
+        {'name': '20-floors-2000', 'floors': 20, 'sections': 2000},
+        {'name': '20-floors-5000', 'floors': 20, 'sections': 5000},
+    ],
+}
+
+
+# Weekly sections one room can take without overlaps: a lecture hall three lectures a day,
+# at most one of them in the evening slot (it overlaps the last morning one), a lab every lab slot
+LECTURES_PER_HALL = 3 * len(DAYS_OF_WEEK)
+EVENING_LECTURES_PER_HALL = len(TIME_SLOTS['lecture']['evening']) * len(DAYS_OF_WEEK)
+LABS_PER_LAB = {shift: len(slots) * len(DAYS_OF_WEEK) for shift, slots in TIME_SLOTS['lab'].items()}
+
+# Share of their weekly slots derived room counts fill, leaving the solvers some room to move
+ROOM_UTILISATION = 0.8
+
+
+def shift_minutes(kind, shift):
+    """Minutes from the first start to the last end of a course kind's slots in one shift"""
+    intervals = [time_slot_interval(time_slot) for time_slot in TIME_SLOTS[kind][shift]]
+    return max(end for _, end in intervals) - min(start for start, _ in intervals)
+
+
+def section_minutes(kind, shift):
+    start, end = time_slot_interval(TIME_SLOTS[kind][shift][0])
+    return end - start
+
+
+def rooms_per_floor(courses, floors, utilisation=ROOM_UTILISATION):
+    """(lecture halls, labs) per floor that fit every section in its own shift's slots"""
+    counts = {}
+    for course in courses:
+        key = (course['course_type'], course['shift'].lower())
+        counts[key] = counts.get(key, 0) + 1
+    lectures = counts.get(('Lecture', 'morning'), 0) + counts.get(('Lecture', 'evening'), 0)
+    halls = max(lectures / LECTURES_PER_HALL, counts.get(('Lecture', 'evening'), 0) / EVENING_LECTURES_PER_HALL)
+    labs = max(counts.get(('Lab', shift), 0) / per_lab for shift, per_lab in LABS_PER_LAB.items())
+    return (max(1, math.ceil(halls / utilisation / floors)),
+            max(1, math.ceil(labs / utilisation / floors)))
+
+
+def infeasible_by_capacity(courses, rooms):
+    """Whether no timetable without teacher or room clashes exists, by ExactSolver's up-front matching
+
+    The matching only needs every section to get a (day, slot) its teacher has
+    free with a room of its type left, so False does not prove a timetable exists.
+    """
+    solver = ExactSolver(courses, rooms, None)
+    solver.node_limit = 0  # Stop right after the matching
+    solver.time_limit = None
+    solver.solve()
+    return solver.status == 'infeasible'
+
+
+def generate_institution(floors=1, sections=50, lecture_halls_per_floor=None, labs_per_floor=None,
+                         teacher_load=4.0, morning_share=0.6, lab_share=0.5, seed=0, name=None):
+    """Synthetic (courses, rooms) at the given scale
+
+    Courses have one to three sections each, like the section_codes of real
+    course documents, and every section of a course shares its teacher.
+    teacher_load is the average number of sections per teacher; loads are
+    skewed so a few teachers carry up to three times the average, but no
+    teacher gets more classes in a shift than fit in its slots (more teachers
+    are hired when nobody has time left). Rooms carry their floor as an
+    attribute; room counts left at None are sized to the sections with
+    rooms_per_floor(). The same arguments always give the same institution.
+    """
+    rng = random.Random(seed)
+
+    n_teachers = max(1, round(sections / teacher_load))
+    teachers = [f'Teacher {i + 1}' for i in range(n_teachers)]
+    teacher_weights = [1 / (i + 1) ** 0.5 for i in range(n_teachers)]
+    teacher_sections = dict.fromkeys(teachers, 0)
+    teacher_minutes = {}  # {(teacher, shift): minutes taught per week}
+    teacher_classes = {}  # {(teacher, kind, shift): sections}
+    max_teacher_sections = max(3, round(3 * teacher_load))
+    shift_budget = {shift: max(shift_minutes(kind, shift) for kind in TIME_SLOTS) * len(DAYS_OF_WEEK)
+                    for shift in ('morning', 'evening')}
+
+    # A teacher takes no more sections of a kind and shift than one room of the type could
+    kind_budget = {('lecture', 'morning'): LECTURES_PER_HALL, ('lecture', 'evening'): EVENING_LECTURES_PER_HALL}
+    kind_budget.update({('lab', shift): per_lab for shift, per_lab in LABS_PER_LAB.items()})
+
+    def has_time(teacher, n_sections, kind, shift):
+        minutes = n_sections * section_minutes(kind, shift)
+        return (teacher_sections[teacher] + n_sections <= max_teacher_sections
+                and teacher_classes.get((teacher, kind, shift), 0) + n_sections <= kind_budget[(kind, shift)]
+                and teacher_minutes.get((teacher, shift), 0) + minutes <= shift_budget[shift])
+
+    courses = []
+    course_number = 0
+    while len(courses) < sections:
+        course_number += 1
+        is_lab = rng.random() < lab_share
+        is_morning = rng.random() < morning_share
+        course = {
+            '_id': f'{course_number:024x}',  # str() of an ObjectId is 24 hex digits too
+            'course_code': f'CS-{1000 + course_number}',
+            'course_name': f"{'Lab' if is_lab else 'Course'} {course_number}",
+            'course_type': 'Lab' if is_lab else 'Lecture',
+            'credit_hour': '1' if is_lab else '3',
+            'shift': 'Morning' if is_morning else 'Evening',
+        }
+        n_sections = min(rng.randint(1, 3), sections - len(courses))
+        kind = 'lab' if is_lab else 'lecture'
+        shift = 'morning' if is_morning else 'evening'
+        teacher = rng.choices(teachers, teacher_weights)[0]
+        for _ in range(4 * len(teachers)):
+            if has_time(teacher, n_sections, kind, shift):
+                break
+            teacher = rng.choice(teachers)
+        else:
+            teacher = f'Teacher {len(teachers) + 1}'
+            teachers.append(teacher)
+            teacher_weights.append(1 / len(teachers) ** 0.5)
+            teacher_sections[teacher] = 0
+        teacher_sections[teacher] += n_sections
+        teacher_classes[(teacher, kind, shift)] = teacher_classes.get((teacher, kind, shift), 0) + n_sections
+        teacher_minutes[(teacher, shift)] = (teacher_minutes.get((teacher, shift), 0)
+                                             + n_sections * section_minutes(kind, shift))
+        course['teacher_name'] = teacher
+
+        prefix = 'MOR' if is_morning else 'EVE'
+        for section in range(n_sections):
+            unit = dict(course)
+            unit['section_code'] = f'{prefix}-{course_number}{chr(ord("A") + section)}'
+            courses.append(unit)
+
+    derived_halls, derived_labs = rooms_per_floor(courses, floors)
+    if lecture_halls_per_floor is None:
+        lecture_halls_per_floor = derived_halls
+    if labs_per_floor is None:
+        labs_per_floor = derived_labs
+
+    rooms = []
+    for floor in range(1, floors + 1):
+        room_types = ['Lecture Hall'] * lecture_halls_per_floor + ['Lab'] * labs_per_floor
+        for i, room_type in enumerate(room_types):
+            rooms.append({'room_number': str(floor * 100 + i + 1), 'type': room_type, 'floor': floor,
+                          'capacity': 60 if room_type == 'Lecture Hall' else 30})
+
+    return courses, rooms
+
+
+def residual_conflicts(courses, rooms, schedule):
+    """Hard and soft violations left in a schedule, counted like the fitness function"""
+    encoding = ProblemEncoding(courses, rooms)
+    genes = encoding.canonical_order(schedule or [])
+    if genes is None:
+        return {'unplaced': len(encoding.units) - len(schedule or [])}
+
+    chromosome = encoding.encode(genes)
+    state = FitnessState(encoding, chromosome)
+    return {
+        'teacher_clashes': state.teacher_clashes,
+        'room_clashes': state.room_clashes,
+        'room_mismatches': state.room_mismatches,
+        'shift_mismatches': state.shift_mismatches,
+        'rooms_used': state.rooms_used,
+        'unplaced': len(courses) - len(schedule),
+    }
+
+
+def build_solver(spec, courses, rooms, options):
+    """Solver for a spec like 'tabu' or 'building:tabu', with options set as attributes"""
+    if spec.startswith('building:'):
+        solver = BuildingScheduler(courses, rooms, backend=spec.split(':', 1)[1])
+        solver.part_options = dict(options)
+    else:
+        solver = create_solver(spec, courses, rooms, None)
+        for name, value in options.items():
+            setattr(solver, name, value)
+    return solver
+
+
+def run_case(case):
+    """Generate one scenario, solve it once and measure the run"""
+    scenario = case['scenario']
+    courses, rooms = generate_institution(**scenario)
+    infeasible = infeasible_by_capacity(courses, rooms)
+    solver = build_solver(case['solver'], courses, rooms, case['options'])
+    solver.seed = case['seed']
+
+    started = time.perf_counter()
+    schedule, fitness = solver.solve()
+    wall_time = time.perf_counter() - started
+
+    stats = solver.stats
+    search_stats = stats.get('reconcile', stats)  # Building solves converge in the reconcile pass
+    evaluations = search_stats.get('evaluations')
+
+    peak_rss_mb = None
+    if resource is not None:
+        # ru_maxrss is kilobytes on Linux, bytes on macOS
+        scale = 1024 * 1024 if sys.platform == 'darwin' else 1024
+        peak_rss_mb = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale, 1)
+
+    return {
+        'scenario': scenario.get('name'),
+        'solver': case['solver'],
+        'options': case['options'],
+        'seed': case['seed'],
+        'sections': len(courses),
+        'rooms': len(rooms),
+        'floors': scenario.get('floors', 1),
+        'teachers': len({course['teacher_name'] for course in courses}),
+        'infeasible_by_capacity': infeasible,
+        'wall_time_s': round(wall_time, 3),
+        'fitness': fitness,
+        'solved': schedule is not None,
+        'generations': search_stats.get('generations', search_stats.get('iterations')),
+        'converged_at': search_stats.get('best_generation', search_stats.get('best_iteration')),
+        'evaluations': evaluations,
+        'evaluations_per_s': round(evaluations / wall_time, 1) if evaluations and wall_time > 0 else None,
+        'peak_rss_mb': peak_rss_mb,
+        'conflicts': residual_conflicts(courses, rooms, schedule),
+        'stats': stats,
+    }
+
+
+def _run_case_in_process(case, results):
+    try:
+        with contextlib.redirect_stdout(sys.stderr):  # Keep solver progress out of the JSON report
+            results.put(run_case(case))
+    except Exception as error:
+        results.put({'scenario': case['scenario'].get('name'), 'solver': case['solver'],
+                     'seed': case['seed'], 'error': f'{type(error).__name__}: {error}'})
+
+
+def run_isolated(case):
+    """run_case() in a fresh process, so peak memory belongs to this run alone"""
+    context = multiprocessing.get_context()
+    results = context.Queue()
+    process = context.Process(target=_run_case_in_process, args=(case, results))
+    process.start()
+    result = results.get()
+    process.join()
+    return result
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def parse_options(pairs):
+    """['generations=300', 'time_limit=None'] -> {'generations': 300, 'time_limit': None}"""
+    options = {}
+    for pair in pairs:
+        name, _, text = pair.partition('=')
+        try:
+            options[name] = ast.literal_eval(text)
+        except (ValueError, SyntaxError):
+            options[name] = text
+    return options
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--suite', choices=sorted(SUITES), help='named scenario set (default: quick)')
+    parser.add_argument('--floors', type=int, help='custom scenario: floors')
+    parser.add_argument('--sections', type=int, help='custom scenario: course sections')
+    parser.add_argument('--teacher-load', type=float, default=4.0, help='custom scenario: sections per teacher')
+    parser.add_argument('--morning-share', type=float, default=0.6, help='custom scenario: share of morning sections')
+    parser.add_argument('--lab-share', type=float, default=0.5, help='custom scenario: share of lab sections')
+    parser.add_argument('--lecture-halls', type=int, help='custom scenario: lecture halls per floor (default: sized to the sections)')
+    parser.add_argument('--labs', type=int, help='custom scenario: labs per floor (default: sized to the sections)')
+    parser.add_argument('--solvers', default='genetic,annealing,tabu',
+                        help="comma-separated backends, 'building:<backend>' for the whole-building solve "
+                             f"(backends: {', '.join(SOLVER_BACKENDS)})")
+    parser.add_argument('--set', action='append', default=[], metavar='NAME=VALUE',
+                        help='solver attribute for every run, e.g. generations=300 (repeatable)')
+    parser.add_argument('--repeat', type=int, default=1, help='runs per scenario and solver, seeds seed..seed+repeat-1')
+    parser.add_argument('--seed', type=int, default=0, help='first solver seed')
+    parser.add_argument('--output', help='write the JSON report here instead of stdout')
+    args = parser.parse_args(argv)
+
+    if args.sections:
+        scenarios = [{'name': 'custom', 'floors': args.floors or 1, 'sections': args.sections,
+                      'teacher_load': args.teacher_load, 'morning_share': args.morning_share,
+                      'lab_share': args.lab_share, 'lecture_halls_per_floor': args.lecture_halls,
+                      'labs_per_floor': args.labs}]
+    else:
+        scenarios = SUITES[args.suite or 'quick']
+
+    solver_specs = [spec.strip() for spec in args.solvers.split(',') if spec.strip()]
+    for spec in solver_specs:
+        if spec.split(':', 1)[-1] not in SOLVER_BACKENDS:
+            parser.error(f"unknown solver '{spec}' (backends: {', '.join(SOLVER_BACKENDS)})")
+    options = parse_options(args.set)
+
+    results = []
+    for scenario in scenarios:
+        for spec in solver_specs:
+            for repeat in range(args.repeat):
+                case = {'scenario': scenario, 'solver': spec, 'options': options, 'seed': args.seed + repeat}
+                print(f"Running {scenario['name']} with {spec} (seed {case['seed']})...", file=sys.stderr)
+                result = run_isolated(case)
+                if 'error' in result:
+                    print(f"  failed: {result['error']}", file=sys.stderr)
+                else:
+                    if result['infeasible_by_capacity']:
+                        print("  no conflict-free timetable exists for this scenario", file=sys.stderr)
+                    print(f"  fitness {result['fitness']} in {result['wall_time_s']}s, "
+                          f"conflicts {result['conflicts']}", file=sys.stderr)
+                results.append(result)
+
+    report = {
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': multiprocessing.cpu_count(),
+        'results': results,
+    }
+    text = json.dumps(report, indent=2, default=str)
+    if args.output:
+        with open(args.output, 'w') as output:
+            output.write(text + '\n')
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
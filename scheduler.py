@@ -0,0 +1,1942 @@
+# Timetable scheduling engine (genetic algorithm) used by the autogenerate routes
+import random
+import copy
+import hashlib
+import heapq
+import multiprocessing
+import operator
+import os
+import pickle
+import time
+import tracemalloc
+import zlib
+from array import array
+from collections import OrderedDict, namedtuple
+from functools import lru_cache
+
+try:
+    import numpy as np
+except ImportError:  # Vectorized batch fitness is optional
+    np = None
+
+# Time slot configurations for scheduling
+TIME_SLOTS = {
+    'lecture': {
+        'morning': [
+            ('8:30 AM', '11:20 AM'),
+            ('11:30 AM', '2:20 PM'),
+            ('2:30 PM', '5:20 PM')
+        ],
+        'evening': [
+            ('5:00 PM', '7:50 PM')
+        ]
+    },
+    'lab': {
+        'morning': [
+            ('8:30 AM', '9:30 AM'), ('9:40 AM', '10:40 AM'), ('10:50 AM', '11:50 AM'),
+            ('12:00 PM', '1:00 PM'), ('1:10 PM', '2:10 PM'), ('2:20 PM', '3:20 PM'),
+            ('3:30 PM', '4:30 PM')
+        ],
+        'evening': [
+            ('5:00 PM', '6:00 PM'), ('6:10 PM', '7:10 PM'), ('7:20 PM', '8:20 PM'),
+            ('8:30 PM', '9:30 PM')
+        ]
+    }
+}
+
+DAYS_OF_WEEK = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday']
+
+# Where evolve() spends its time, reported in stats['phase_times'] (seconds)
+GA_PHASES = ('construction', 'fitness', 'selection', 'crossover', 'mutation')
+
+CHECKPOINT_VERSION = 2  # Bump when the saved state changes shape; older checkpoints are then ignored
+
+def get_time_slots_for_course(course):
+    """Get appropriate time slots for a course based on type and shift"""
+    course_type = course.get('course_type', 'Lecture')
+    shift_field = course.get('shift', '')
+    section_code = course.get('section_code', '')
+
+    slot_type = 'lab' if course_type == 'Lab' else 'lecture'
+
+    # Determine shift from shift field or section_code
+    is_morning = shift_field == 'Morning' or section_code.startswith('MOR')
+    shift = 'morning' if is_morning else 'evening'
+
+    return TIME_SLOTS[slot_type][shift]
+
+@lru_cache(maxsize=None)
+def is_morning_slot(time_slot):
+    """Whether a (start, end) slot belongs to the morning shift (5:xx starts are evening)"""
+    start_time = time_slot[0]
+    return 'AM' in start_time and not start_time.startswith('5:')
+
+def time_to_minutes(time_text):
+    """Minutes after midnight for a time like '8:30 AM', or None when it can't be parsed"""
+    try:
+        clock, meridiem = time_text.split()
+        hours, minutes = (int(part) for part in clock.split(':'))
+    except (AttributeError, ValueError):
+        return None
+    meridiem = meridiem.upper()
+    if meridiem not in ('AM', 'PM') or not 1 <= hours <= 12 or not 0 <= minutes < 60:
+        return None
+    return (hours % 12 + (12 if meridiem == 'PM' else 0)) * 60 + minutes
+
+@lru_cache(maxsize=None)
+def time_slot_interval(time_slot):
+    """(start, end) minutes of a (start_time, end_time) pair, or None when it can't be parsed"""
+    start, end = (time_to_minutes(t) for t in time_slot)
+    if start is None or end is None or end <= start:
+        return None
+    return start, end
+
+def time_slots_overlap(slot1, slot2):
+    """Whether two (start_time, end_time) pairs share any minute"""
+    interval1 = time_slot_interval(slot1)
+    interval2 = time_slot_interval(slot2)
+    if interval1 is None or interval2 is None:
+        return False
+    return interval1[0] < interval2[1] and interval2[0] < interval1[1]
+
+def time_slot_minute_mask(time_slot):
+    """Int with bit m set for every minute m of a (start_time, end_time) pair (0 when unparseable)"""
+    interval = time_slot_interval(time_slot)
+    if interval is None:
+        return 0
+    start, end = interval
+    return ((1 << (end - start)) - 1) << start
+
+class TeacherOccupancy:
+    """Campus-wide teacher x day x minute occupancy of scheduled classes
+
+    Built from the whole scheduled_classes collection (load it with PROJECTION)
+    once per request. busy_minutes() hands a solver the time each teacher is
+    already teaching elsewhere as fixed blocked time.
+    """
+
+    PROJECTION = {'_id': 0, 'teacher_name': 1, 'day': 1, 'start_time': 1, 'end_time': 1, 'floor': 1}
+
+    def __init__(self, scheduled_classes=()):
+        self.entries = {}  # {(teacher, day): {floor: {time_slot}}}
+        for scheduled_class in scheduled_classes:
+            key = (scheduled_class.get('teacher_name'), scheduled_class.get('day'))
+            time_slot = (scheduled_class.get('start_time'), scheduled_class.get('end_time'))
+            self.entries.setdefault(key, {}).setdefault(scheduled_class.get('floor'), set()).add(time_slot)
+
+    def busy_minutes(self, teachers=None, exclude_floor=None):
+        """{(teacher, day): minute bitmask} for the given teachers, ignoring one floor's classes"""
+        busy = {}
+        for (teacher, day), floors in self.entries.items():
+            if teachers is not None and teacher not in teachers:
+                continue
+            minutes = 0
+            for floor, slots in floors.items():
+                if floor != exclude_floor:
+                    for time_slot in slots:
+                        minutes |= time_slot_minute_mask(time_slot)
+            if minutes:
+                busy[(teacher, day)] = minutes
+        return busy
+
+def count_overlapping(slot_counts, time_slot):
+    """Classes in slot_counts ({time_slot: count}) whose different slot overlaps time_slot"""
+    return sum(count for other, count in slot_counts.items()
+               if other != time_slot and time_slots_overlap(other, time_slot))
+
+def draw_seed():
+    """Fresh RNG seed for a solve that was not given one"""
+    return random.SystemRandom().randrange(2 ** 32)
+
+class Gene(namedtuple('Gene', ['course_id', 'course_code', 'course_name', 'teacher_name', 'shift',
+                                'section_code', 'day', 'time_slot', 'room'])):
+    """One scheduled class: an immutable record that shares its course strings and room document
+
+    Genes are read like the dicts they replace (gene['room'], gene.get('shift')).
+    Changing a gene means building a new one with replace(), so schedules can
+    share genes instead of deep-copying them.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def for_course(cls, course, day, time_slot, room):
+        section_code = course.get('section_code', '')
+        return cls(str(course['_id']), section_code, course.get('course_name', ''),
+                   course.get('teacher_name', ''), course.get('shift', ''), section_code,
+                   day, time_slot, room)
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return getattr(self, key)
+        return tuple.__getitem__(self, key)
+
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+
+    def replace(self, **changes):
+        return self._replace(**changes)
+
+class ProblemEncoding:
+    """Shared lookup tables for the integer-encoded chromosome
+
+    A chromosome is an array of ints with one entry per schedulable unit (in the
+    same order create_encoded_chromosome places them). Each entry packs (day, slot, room)
+    as (day * n_slots + slot) * n_rooms + room, so the value itself doubles as the
+    room occupancy key used by the fitness function.
+    """
+
+    def __init__(self, courses, rooms, existing_schedules=None, teacher_busy=None,
+                 previous_schedule=None, move_penalty=0):
+        # Every distinct time slot across course types and shifts
+        self.slots = []
+        self.slot_index = {}
+        for slot_type in ('lecture', 'lab'):
+            for shift in ('morning', 'evening'):
+                for time_slot in TIME_SLOTS[slot_type][shift]:
+                    if time_slot not in self.slot_index:
+                        self.slot_index[time_slot] = len(self.slots)
+                        self.slots.append(time_slot)
+
+        # Rooms are keyed by room_number (duplicates keep the first document)
+        self.rooms = []
+        self.room_index = {}
+        for room in rooms:
+            room_num = room.get('room_number')
+            if room_num not in self.room_index:
+                self.room_index[room_num] = len(self.rooms)
+                self.rooms.append(room)
+        self.room_types = [r.get('type', '') for r in self.rooms]
+
+        self.n_days = len(DAYS_OF_WEEK)
+        self.n_slots = len(self.slots)
+        self.n_rooms = len(self.rooms)
+        self.n_codes = self.n_days * self.n_slots * self.n_rooms
+
+        # Decode tables: code -> day / slot / room / (day, slot) / (day, room) index
+        self.code_day = []
+        self.code_slot = []
+        self.code_room = []
+        self.code_day_slot = []
+        self.code_block = []
+        for day in range(self.n_days):
+            for slot in range(self.n_slots):
+                for room in range(self.n_rooms):
+                    self.code_day.append(day)
+                    self.code_slot.append(slot)
+                    self.code_room.append(room)
+                    self.code_day_slot.append(day * self.n_slots + slot)
+                    self.code_block.append(day * self.n_rooms + room)
+
+        # Morning slots are the AM ones (5:xx starts belong to the evening shift)
+        self.slot_morning = [is_morning_slot(time_slot) for time_slot in self.slots]
+
+        # Rooms in the order create_encoded_chromosome fills them
+        self.labs = sorted((i for i, r in enumerate(self.rooms) if r.get('type') == 'Lab'),
+                           key=lambda i: self.rooms[i].get('room_number', 999))
+        self.lecture_halls = sorted((i for i, r in enumerate(self.rooms) if r.get('type') == 'Lecture Hall'),
+                                    key=lambda i: self.rooms[i].get('room_number', 999))
+
+        # Schedulable units: labs first, then lectures (the order rooms are filled in)
+        lab_courses = [c for c in courses if c.get('credit_hour') in ['1', 1]]
+        lecture_courses = [c for c in courses if c.get('credit_hour') in ['3', 3]]
+        self.skipped_courses = []
+        if not self.labs:
+            self.skipped_courses += [f"{c.get('course_name')} (no lab rooms available)" for c in lab_courses]
+            lab_courses = []
+        if not self.lecture_halls:
+            self.skipped_courses += [f"{c.get('course_name')} (no lecture halls available)" for c in lecture_courses]
+            lecture_courses = []
+        self.units = lab_courses + lecture_courses
+        self.n_courses = len(courses)  # "All courses scheduled" bonus needs every course placed
+
+        # Canonical gene order: (course_id, section_code) -> unit
+        self.unit_index = {}
+        for unit, course in enumerate(self.units):
+            self.unit_index.setdefault((str(course['_id']), course.get('section_code', '')), unit)
+
+        # Section domains, computed once per solve. Sections of the same type and
+        # shift share one array of slot indices; sections of a room type share
+        # one array of room indices.
+        self.teacher_index = {}
+        self.unit_teacher = []
+        self.unit_slots = []  # Allowed slot indices
+        self.unit_rooms = []  # Allowed room indices, in filling order
+        self.unit_room_type = []
+        self.unit_morning = []
+        self.unit_slot_mask = []  # Allowed slots as a bitmask
+        self.unit_shift_mask = []  # Slots of the section's own shift as a bitmask (no shift penalty)
+        morning_mask = sum(1 << slot for slot, morning in enumerate(self.slot_morning) if morning)
+        shift_masks = {True: morning_mask, False: ((1 << self.n_slots) - 1) & ~morning_mask}
+        room_domains = {'Lab': array('h', self.labs), 'Lecture Hall': array('h', self.lecture_halls)}
+        slot_domains = {}  # {(course_type is Lab, is morning): (slot array, slot mask)}
+        for course in self.units:
+            teacher = course.get('teacher_name', '')
+            self.unit_teacher.append(self.teacher_index.setdefault(teacher, len(self.teacher_index)))
+            is_morning = course.get('shift', '') == 'Morning' or course.get('section_code', '').startswith('MOR')
+            domain_key = (course.get('course_type', 'Lecture') == 'Lab', is_morning)
+            if domain_key not in slot_domains:
+                slots = array('h', (self.slot_index[s] for s in get_time_slots_for_course(course)))
+                slot_domains[domain_key] = (slots, sum(1 << slot for slot in slots))
+            slots, slot_mask = slot_domains[domain_key]
+            self.unit_slots.append(slots)
+            self.unit_slot_mask.append(slot_mask)
+            room_type = 'Lab' if course.get('credit_hour') in ['1', 1] else 'Lecture Hall'
+            self.unit_room_type.append(room_type)
+            self.unit_rooms.append(room_domains[room_type])
+            self.unit_morning.append(is_morning)
+            self.unit_shift_mask.append(shift_masks[is_morning])
+
+        # Teacher occupancy key = teacher * (n_days * n_slots) + day_slot
+        day_slots = self.n_days * self.n_slots
+        self.unit_teacher_base = [t * day_slots for t in self.unit_teacher]
+
+        # Slot overlap matrix: teacher and room clashes cover every pair of slots
+        # that share a minute, not only identical slots
+        self.slot_overlaps = [[time_slots_overlap(a, b) for b in self.slots] for a in self.slots]
+        self.slot_overlap_mask = [sum(1 << j for j, overlap in enumerate(row) if overlap) for row in self.slot_overlaps]
+        self.slot_neighbours = [tuple(j for j, overlap in enumerate(row) if overlap and j != i)
+                                for i, row in enumerate(self.slot_overlaps)]
+        # Key offsets from a slot to its overlapping slots (same teacher/room and day)
+        self.slot_teacher_offsets = [tuple(j - i for j in neighbours) for i, neighbours in enumerate(self.slot_neighbours)]
+        self.slot_room_offsets = [tuple((j - i) * self.n_rooms for j in neighbours)
+                                  for i, neighbours in enumerate(self.slot_neighbours)]
+
+        # Classes that must be preserved. A class in exactly an assignable slot
+        # pre-occupies that key; every other preserved class whose time overlaps
+        # a slot adds one clash per gene placed there.
+        self.existing_teacher_keys = set()
+        self.existing_room_keys = set()
+        self.existing_teacher_overlaps = {}  # {teacher_key: overlapping preserved classes}
+        self.existing_room_overlaps = {}  # {code: overlapping preserved classes}
+        self.existing_teacher_blocked = {}  # {teacher * n_days + day: slot bits that would clash}
+        self.existing_room_blocked = {}  # {room * n_days + day: slot bits that would clash}
+        day_index = {day: i for i, day in enumerate(DAYS_OF_WEEK)}
+        # Saved classes hold room_number as an int, room documents may hold it as a string
+        room_lookup = {str(room_num): room for room_num, room in self.room_index.items()}
+        preserved = set()  # Distinct (resource, day, time slot); duplicates block a key once
+        for existing in existing_schedules or []:
+            day = day_index.get(existing.get('day'))
+            if day is None:
+                continue  # Never on a day the solver can assign
+            time_slot = (existing.get('start_time'), existing.get('end_time'))
+            teacher = self.teacher_index.get(existing.get('teacher_name'))
+            if teacher is not None:
+                preserved.add(('teacher', teacher, day, time_slot))
+            room = room_lookup.get(str(existing.get('room_number')))
+            if room is not None:
+                preserved.add(('room', room, day, time_slot))
+
+        for kind, owner, day, time_slot in preserved:
+            slot = self.slot_index.get(time_slot)
+            blocked = 0
+            for other in range(self.n_slots):
+                if other == slot:
+                    blocked |= 1 << other
+                elif time_slots_overlap(time_slot, self.slots[other]):
+                    blocked |= 1 << other
+                    day_slot = day * self.n_slots + other
+                    if kind == 'teacher':
+                        key = owner * day_slots + day_slot
+                        self.existing_teacher_overlaps[key] = self.existing_teacher_overlaps.get(key, 0) + 1
+                    else:
+                        key = day_slot * self.n_rooms + owner
+                        self.existing_room_overlaps[key] = self.existing_room_overlaps.get(key, 0) + 1
+            if slot is not None:
+                day_slot = day * self.n_slots + slot
+                if kind == 'teacher':
+                    self.existing_teacher_keys.add(owner * day_slots + day_slot)
+                else:
+                    self.existing_room_keys.add(day_slot * self.n_rooms + owner)
+            blocked_map = self.existing_teacher_blocked if kind == 'teacher' else self.existing_room_blocked
+            index = owner * self.n_days + day
+            blocked_map[index] = blocked_map.get(index, 0) | blocked
+
+        # Fixed blocked time ({(teacher_name, day): minute bitmask}, e.g. classes on
+        # other floors): one clash per gene in a slot that shares a busy minute
+        slot_minutes = [time_slot_minute_mask(time_slot) for time_slot in self.slots]
+        for (teacher_name, day_name), minutes in (teacher_busy or {}).items():
+            teacher = self.teacher_index.get(teacher_name)
+            day = day_index.get(day_name)
+            if teacher is None or day is None:
+                continue
+            blocked = 0
+            for slot in range(self.n_slots):
+                if slot_minutes[slot] & minutes:
+                    blocked |= 1 << slot
+                    key = teacher * day_slots + day * self.n_slots + slot
+                    self.existing_teacher_overlaps[key] = self.existing_teacher_overlaps.get(key, 0) + 1
+            if blocked:
+                index = teacher * self.n_days + day
+                self.existing_teacher_blocked[index] = self.existing_teacher_blocked.get(index, 0) | blocked
+
+        # Minimal perturbation: each section's current placement (-1 = not placed
+        # yet), and the penalty for every section moved away from it
+        self.move_penalty = move_penalty
+        self.unit_previous = array('i', [-1] * len(self.units))
+        for placed in previous_schedule or []:
+            unit = self.unit_index.get((str(placed.get('course_id')), placed.get('section_code')))
+            day = day_index.get(placed.get('day'))
+            slot = self.slot_index.get((placed.get('start_time'), placed.get('end_time')))
+            room = room_lookup.get(str(placed.get('room_number')))
+            if unit is not None and day is not None and slot is not None and room is not None:
+                self.unit_previous[unit] = self.pack(day, slot, room)
+
+    def pack(self, day, slot, room):
+        """Pack day, slot and room indices into a single gene value"""
+        return (day * self.n_slots + slot) * self.n_rooms + room
+
+    def canonical_order(self, genes):
+        """Genes sorted by schedulable unit, or None unless there is exactly one per unit"""
+        ordered = [None] * len(self.units)
+        for gene in genes:
+            unit = self.unit_index.get((gene['course_id'], gene['section_code']))
+            if unit is None or ordered[unit] is not None:
+                return None
+            ordered[unit] = gene
+        if any(gene is None for gene in ordered):
+            return None
+        return ordered
+
+    def encode(self, genes):
+        """Convert a list of genes (in unit order) to an integer chromosome"""
+        day_index = {day: i for i, day in enumerate(DAYS_OF_WEEK)}
+        return array('i', (
+            self.pack(day_index[g['day']], self.slot_index[g['time_slot']],
+                      self.room_index[g['room']['room_number']])
+            for g in genes
+        ))
+
+    def decode(self, chromosome):
+        """Expand an integer chromosome back into Gene records for saving"""
+        genes = []
+        for unit, code in enumerate(chromosome):
+            course = self.units[unit]
+            genes.append(Gene.for_course(course, DAYS_OF_WEEK[self.code_day[code]],
+                                         self.slots[self.code_slot[code]],
+                                         self.rooms[self.code_room[code]]))
+        return genes
+
+def encoded_fitness(encoding, chromosome):
+    """Score an integer chromosome, the reference definition of the fitness
+
+    100 points per placed section, minus 500 per room type mismatch, 50 per
+    teacher or room clash (with another gene or a preserved class, same or
+    overlapping slot), 30 per shift mismatch and move_penalty per moved section;
+    then a small reward for using few, evenly filled rooms, a penalty for
+    uneven days and 500 points when every course is placed. FitnessState and
+    BatchFitnessEvaluator compute the same score incrementally and in bulk.
+    """
+    code_day = encoding.code_day
+    code_slot = encoding.code_slot
+    code_room = encoding.code_room
+    code_day_slot = encoding.code_day_slot
+    room_types = encoding.room_types
+    unit_room_type = encoding.unit_room_type
+    unit_teacher_base = encoding.unit_teacher_base
+    unit_morning = encoding.unit_morning
+    slot_morning = encoding.slot_morning
+    existing_teacher_keys = encoding.existing_teacher_keys
+    existing_room_keys = encoding.existing_room_keys
+    existing_teacher_overlaps = encoding.existing_teacher_overlaps
+    existing_room_overlaps = encoding.existing_room_overlaps
+    slot_teacher_offsets = encoding.slot_teacher_offsets
+    slot_room_offsets = encoding.slot_room_offsets
+    unit_previous = encoding.unit_previous
+    move_penalty = encoding.move_penalty
+
+    score = len(chromosome) * 100
+
+    teacher_schedule = {}  # {teacher_key: genes}
+    room_schedule = {}  # {code: genes}
+    day_counts = [0] * encoding.n_days
+    room_course_counts = {}
+
+    for unit, code in enumerate(chromosome):
+        room = code_room[code]
+        day_counts[code_day[code]] += 1
+
+        # 3ch must be in Lecture Hall, 1ch must be in Lab
+        if room_types[room] != unit_room_type[unit]:
+            score -= 500
+
+        # Clashes: same slot as an earlier gene or preserved class, plus every
+        # earlier gene and preserved class in an overlapping slot
+        slot = code_slot[code]
+        teacher_key = unit_teacher_base[unit] + code_day_slot[code]
+        count = teacher_schedule.get(teacher_key, 0) + 1
+        teacher_schedule[teacher_key] = count
+        clashes = existing_teacher_overlaps.get(teacher_key, 0)
+        if count > 1 or teacher_key in existing_teacher_keys:
+            clashes += 1
+        for offset in slot_teacher_offsets[slot]:
+            clashes += teacher_schedule.get(teacher_key + offset, 0)
+
+        count = room_schedule.get(code, 0) + 1
+        room_schedule[code] = count
+        clashes += existing_room_overlaps.get(code, 0)
+        if count > 1 or code in existing_room_keys:
+            clashes += 1
+        for offset in slot_room_offsets[slot]:
+            clashes += room_schedule.get(code + offset, 0)
+        score -= clashes * 50
+
+        if slot_morning[slot] != unit_morning[unit]:
+            score -= 30
+
+        if unit_previous[unit] >= 0 and code != unit_previous[unit]:
+            score -= move_penalty
+
+        room_course_counts[room] = room_course_counts.get(room, 0) + 1
+
+    lecture_halls_used = sum(1 for r in room_course_counts if room_types[r] == 'Lecture Hall')
+    labs_used = sum(1 for r in room_course_counts if room_types[r] == 'Lab')
+    score -= max(0, lecture_halls_used - 1) * 5 + max(0, labs_used - 1) * 5
+
+    total_rooms_used = lecture_halls_used + labs_used
+    if total_rooms_used == 1:
+        score += 50
+    elif total_rooms_used == 2:
+        score += 30
+    elif total_rooms_used == 3:
+        score += 15
+    elif total_rooms_used <= 4:
+        score += 5
+
+    if len(room_course_counts) > 0:
+        avg_courses_per_room = sum(room_course_counts.values()) / len(room_course_counts)
+        variance = sum(abs(count - avg_courses_per_room) for count in room_course_counts.values())
+        if variance < len(room_course_counts):
+            score += 100
+
+    avg_per_day = len(chromosome) / encoding.n_days
+    balance_penalty = sum(abs(count - avg_per_day) for count in day_counts)
+    score -= balance_penalty * 2
+
+    if len(chromosome) == encoding.n_courses:
+        score += 500
+
+    return max(score, 0)
+
+class OccupancyGrid:
+    """Room x day x slot occupancy bitsets with per-day fill counters
+
+    Each (room, day) holds an int whose bit i is set when slot i is taken or
+    overlaps a taken slot, so "first free slot of a shift" is a mask and a
+    lowest-bit lookup.
+    """
+
+    __slots__ = ('n_days', 'overlap_mask', 'busy', 'fill')
+
+    def __init__(self, n_rooms, n_days, overlap_mask):
+        self.n_days = n_days
+        self.overlap_mask = overlap_mask  # Per slot: bits of the slots it overlaps, itself included
+        self.busy = [0] * (n_rooms * n_days)
+        self.fill = [0] * (n_rooms * n_days)
+
+    def first_free_slot(self, room, day, slot_mask):
+        """Lowest free slot index within slot_mask, or -1 when all are taken"""
+        free = slot_mask & ~self.busy[room * self.n_days + day]
+        return (free & -free).bit_length() - 1
+
+    def days_by_fill(self, room):
+        """Days of a room, fullest first (ties keep Monday-first order)"""
+        fill = self.fill
+        base = room * self.n_days
+        return sorted(range(self.n_days), key=lambda day: -fill[base + day])
+
+    def occupy(self, room, day, slot):
+        index = room * self.n_days + day
+        self.busy[index] |= self.overlap_mask[slot]
+        self.fill[index] += 1
+
+class FitnessState:
+    """Occupancy counters and penalty tallies behind an encoded chromosome's fitness
+
+    States are shared between a parent and an unchanged child. When genes change,
+    copy() the state and move() each changed gene, which updates the tallies in
+    O(1) instead of rescoring the whole chromosome.
+    """
+
+    __slots__ = ('encoding', 'teacher_counts', 'room_counts', 'day_counts', 'room_use',
+                 'room_mismatches', 'shift_mismatches', 'teacher_clashes', 'room_clashes',
+                 'lecture_halls_used', 'labs_used', 'rooms_used', 'moved', 'fitness')
+
+    def __init__(self, encoding, chromosome=None):
+        self.encoding = encoding
+        if chromosome is None:
+            return  # Filled in by copy()
+
+        self.teacher_counts = {}  # {teacher_key: genes}, preserved classes are kept apart
+        self.room_counts = {}  # {code: genes}
+        self.day_counts = [0] * encoding.n_days
+        self.room_use = [0] * encoding.n_rooms
+        self.room_mismatches = 0
+        self.shift_mismatches = 0
+        self.teacher_clashes = 0
+        self.room_clashes = 0
+        self.lecture_halls_used = 0
+        self.labs_used = 0
+        self.rooms_used = 0
+        self.moved = 0  # Sections away from their previous placement
+        self.fitness = None
+
+        for unit, code in enumerate(chromosome):
+            self._add(unit, code)
+
+    def copy(self):
+        """Return an independent copy of the counters"""
+        state = FitnessState(self.encoding)
+        state.teacher_counts = self.teacher_counts.copy()
+        state.room_counts = self.room_counts.copy()
+        state.day_counts = self.day_counts[:]
+        state.room_use = self.room_use[:]
+        state.room_mismatches = self.room_mismatches
+        state.shift_mismatches = self.shift_mismatches
+        state.teacher_clashes = self.teacher_clashes
+        state.room_clashes = self.room_clashes
+        state.lecture_halls_used = self.lecture_halls_used
+        state.labs_used = self.labs_used
+        state.rooms_used = self.rooms_used
+        state.moved = self.moved
+        state.fitness = self.fitness
+        return state
+
+    def move(self, unit, old_code, new_code):
+        """Update the counters for one gene changing value"""
+        if old_code != new_code:
+            self._remove(unit, old_code)
+            self._add(unit, new_code)
+            self.fitness = None
+
+    def _add(self, unit, code):
+        enc = self.encoding
+        room = enc.code_room[code]
+        slot = enc.code_slot[code]
+        self.day_counts[enc.code_day[code]] += 1
+
+        self.room_use[room] += 1
+        if self.room_use[room] == 1:
+            self._count_room(room, 1)
+
+        if enc.room_types[room] != enc.unit_room_type[unit]:
+            self.room_mismatches += 1
+        if enc.slot_morning[slot] != enc.unit_morning[unit]:
+            self.shift_mismatches += 1
+        if enc.unit_previous[unit] >= 0 and code != enc.unit_previous[unit]:
+            self.moved += 1
+
+        # A gene clashes when its key is already held by another gene or preserved
+        # class, and once with every gene or preserved class in an overlapping slot
+        teacher_key = enc.unit_teacher_base[unit] + enc.code_day_slot[code]
+        self.teacher_clashes += self._clashes(self.teacher_counts, teacher_key, enc.existing_teacher_keys,
+                                              enc.existing_teacher_overlaps, enc.slot_teacher_offsets[slot])
+        self.teacher_counts[teacher_key] = self.teacher_counts.get(teacher_key, 0) + 1
+
+        self.room_clashes += self._clashes(self.room_counts, code, enc.existing_room_keys,
+                                           enc.existing_room_overlaps, enc.slot_room_offsets[slot])
+        self.room_counts[code] = self.room_counts.get(code, 0) + 1
+
+    def _remove(self, unit, code):
+        enc = self.encoding
+        room = enc.code_room[code]
+        slot = enc.code_slot[code]
+        self.day_counts[enc.code_day[code]] -= 1
+
+        self.room_use[room] -= 1
+        if self.room_use[room] == 0:
+            self._count_room(room, -1)
+
+        if enc.room_types[room] != enc.unit_room_type[unit]:
+            self.room_mismatches -= 1
+        if enc.slot_morning[slot] != enc.unit_morning[unit]:
+            self.shift_mismatches -= 1
+        if enc.unit_previous[unit] >= 0 and code != enc.unit_previous[unit]:
+            self.moved -= 1
+
+        teacher_key = enc.unit_teacher_base[unit] + enc.code_day_slot[code]
+        count = self.teacher_counts[teacher_key] - 1
+        if count:
+            self.teacher_counts[teacher_key] = count
+        else:
+            del self.teacher_counts[teacher_key]
+        self.teacher_clashes -= self._clashes(self.teacher_counts, teacher_key, enc.existing_teacher_keys,
+                                              enc.existing_teacher_overlaps, enc.slot_teacher_offsets[slot])
+
+        count = self.room_counts[code] - 1
+        if count:
+            self.room_counts[code] = count
+        else:
+            del self.room_counts[code]
+        self.room_clashes -= self._clashes(self.room_counts, code, enc.existing_room_keys,
+                                           enc.existing_room_overlaps, enc.slot_room_offsets[slot])
+
+    @staticmethod
+    def _clashes(counts, key, existing_keys, existing_overlaps, offsets):
+        """Clashes a gene at key adds on top of the genes already in counts"""
+        clashes = existing_overlaps.get(key, 0)
+        if counts.get(key) or key in existing_keys:
+            clashes += 1
+        for offset in offsets:
+            clashes += counts.get(key + offset, 0)
+        return clashes
+
+    def in_conflict(self, unit, code):
+        """Whether the gene placed at code clashes with any other gene or preserved class"""
+        enc = self.encoding
+        slot = enc.code_slot[code]
+        teacher_key = enc.unit_teacher_base[unit] + enc.code_day_slot[code]
+        self.teacher_counts[teacher_key] -= 1
+        self.room_counts[code] -= 1
+        try:
+            return bool(self._clashes(self.teacher_counts, teacher_key, enc.existing_teacher_keys,
+                                      enc.existing_teacher_overlaps, enc.slot_teacher_offsets[slot])
+                        or self._clashes(self.room_counts, code, enc.existing_room_keys,
+                                         enc.existing_room_overlaps, enc.slot_room_offsets[slot]))
+        finally:
+            self.teacher_counts[teacher_key] += 1
+            self.room_counts[code] += 1
+
+    def _count_room(self, room, delta):
+        room_type = self.encoding.room_types[room]
+        if room_type == 'Lecture Hall':
+            self.lecture_halls_used += delta
+        elif room_type == 'Lab':
+            self.labs_used += delta
+        self.rooms_used += delta
+
+    def score(self, chromosome):
+        """Fitness from the counters (identical to encoded_fitness)"""
+        if self.fitness is not None:
+            return self.fitness
+
+        enc = self.encoding
+        n_genes = len(chromosome)
+        score = n_genes * 100
+        score -= self.room_mismatches * 500
+        score -= (self.teacher_clashes + self.room_clashes) * 50
+        score -= self.shift_mismatches * 30
+        score -= self.moved * enc.move_penalty
+
+        score -= max(0, self.lecture_halls_used - 1) * 5 + max(0, self.labs_used - 1) * 5
+
+        total_rooms_used = self.lecture_halls_used + self.labs_used
+        if total_rooms_used == 1:
+            score += 50
+        elif total_rooms_used == 2:
+            score += 30
+        elif total_rooms_used == 3:
+            score += 15
+        elif total_rooms_used <= 4:
+            score += 5
+
+        # Balanced room filling: sum(|count - avg|) < rooms, scaled by rooms to stay in integers
+        rooms_used = self.rooms_used
+        if rooms_used > 0:
+            deviation = sum(abs(rooms_used * count - n_genes) for count in self.room_use if count)
+            if deviation == rooms_used * rooms_used and rooms_used & (rooms_used - 1):
+                # Exact tie with an inexact average: redo the float sum in first-use room order
+                avg_courses_per_room = n_genes / rooms_used
+                first_use = dict.fromkeys(enc.code_room[code] for code in chromosome)
+                variance = sum(abs(self.room_use[room] - avg_courses_per_room) for room in first_use)
+                balanced = variance < rooms_used
+            else:
+                balanced = deviation < rooms_used * rooms_used
+            if balanced:
+                score += 100
+
+        avg_per_day = n_genes / enc.n_days
+        balance_penalty = sum(abs(count - avg_per_day) for count in self.day_counts)
+        score -= balance_penalty * 2
+
+        if n_genes == enc.n_courses:
+            score += 500
+
+        self.fitness = max(score, 0)
+        return self.fitness
+
+class BatchFitnessEvaluator:
+    """Vectorized fitness for a whole population of encoded chromosomes (needs numpy)
+
+    evaluate() takes a (population x genes) int array and returns the score
+    vector. Every term of encoded_fitness is computed with sorts and
+    bincounts over the whole matrix, and the scores match it exactly
+    (tests/test_scheduler.py). As it rescores every chromosome in full, it beats
+    the 'full' mode (about 40% less fitness time on 1500 sections) but not the
+    default 'incremental' one, which only replays the genes a child changed.
+    """
+
+    def __init__(self, scheduler):
+        self.scheduler = scheduler
+        enc = self.encoding = scheduler.encoding
+
+        self.code_day = np.array(enc.code_day, dtype=np.int64)
+        self.code_slot = np.array(enc.code_slot, dtype=np.int64)
+        self.code_room = np.array(enc.code_room, dtype=np.int64)
+        self.code_day_slot = np.array(enc.code_day_slot, dtype=np.int64)
+        self.unit_teacher_base = np.array(enc.unit_teacher_base, dtype=np.int64)
+        self.unit_previous = np.array(enc.unit_previous, dtype=np.int64)
+        self.units = np.arange(len(enc.units))
+
+        room_types = np.array(enc.room_types, dtype=object)
+        unit_room_type = np.array(enc.unit_room_type, dtype=object)
+        # (unit, room) -> wrong room type, (unit, slot) -> wrong shift
+        self.room_mismatch = (unit_room_type[:, None] != room_types[None, :]).astype(np.int64)
+        self.shift_mismatch = (np.array(enc.unit_morning)[:, None] != np.array(enc.slot_morning)[None, :]).astype(np.int64)
+        self.is_lecture_hall = room_types == 'Lecture Hall'
+        self.is_lab = room_types == 'Lab'
+
+        self.n_teacher_keys = max(len(enc.teacher_index) * enc.n_days * enc.n_slots, 1)
+        self.existing_teacher = np.zeros(self.n_teacher_keys, dtype=bool)
+        self.existing_teacher[list(enc.existing_teacher_keys)] = True
+        self.existing_room = np.zeros(max(enc.n_codes, 1), dtype=bool)
+        self.existing_room[list(enc.existing_room_keys)] = True
+        self.existing_teacher_overlaps = np.zeros(self.n_teacher_keys, dtype=np.int64)
+        for key, count in enc.existing_teacher_overlaps.items():
+            self.existing_teacher_overlaps[key] = count
+        self.existing_room_overlaps = np.zeros(max(enc.n_codes, 1), dtype=np.int64)
+        for key, count in enc.existing_room_overlaps.items():
+            self.existing_room_overlaps[key] = count
+
+        # (slot, k) key offsets to the overlapping slots after it, so each overlapping
+        # pair of genes is counted once; padded entries are masked out
+        later = [[j for j in neighbours if j > i] for i, neighbours in enumerate(enc.slot_neighbours)]
+        width = max([len(slots) for slots in later] + [1])
+        self.later_slot_offsets = np.zeros((enc.n_slots, width), dtype=np.int64)
+        self.later_slot_valid = np.zeros((enc.n_slots, width), dtype=bool)
+        for i, slots in enumerate(later):
+            self.later_slot_offsets[i, :len(slots)] = [j - i for j in slots]
+            self.later_slot_valid[i, :len(slots)] = True
+
+    def population_matrix(self, chromosomes):
+        """Stack array('i') chromosomes into a (population x genes) int32 matrix"""
+        n_genes = len(chromosomes[0])
+        return np.frombuffer(b''.join(chromosomes), dtype=np.int32).reshape(len(chromosomes), n_genes)
+
+    def _clashes(self, keys, slots, key_space, slot_scale, existing, existing_overlaps):
+        # Per key, encoded_fitness penalizes max(existing + genes - 1, 0) genes, which
+        # sums to genes - distinct keys + distinct keys already held by preserved classes
+        n_pop = keys.shape[0]
+        flat = np.sort(keys + np.arange(n_pop)[:, None] * key_space, axis=None)
+        sorted_keys = flat.reshape(keys.shape) - np.arange(n_pop)[:, None] * key_space
+        first = np.ones(keys.shape, dtype=bool)
+        first[:, 1:] = sorted_keys[:, 1:] != sorted_keys[:, :-1]
+        clashes = keys.shape[1] - first.sum(axis=1) + (first & existing[sorted_keys]).sum(axis=1)
+
+        # Plus one per preserved class, and per gene pair, in overlapping slots
+        clashes += existing_overlaps[keys].sum(axis=1)
+        targets = (keys + np.arange(n_pop)[:, None] * key_space)[:, :, None] + self.later_slot_offsets[slots] * slot_scale
+        targets = np.where(self.later_slot_valid[slots], targets, -1)
+        pairs = np.searchsorted(flat, targets, side='right') - np.searchsorted(flat, targets, side='left')
+        return clashes + pairs.sum(axis=(1, 2))
+
+    def evaluate(self, matrix):
+        """Return the fitness of every row of a (population x genes) matrix"""
+        enc = self.encoding
+        codes = matrix.astype(np.int64)
+        n_pop, n_genes = codes.shape
+        rows = np.arange(n_pop)[:, None]
+
+        rooms = self.code_room[codes]
+        room_mismatches = self.room_mismatch[self.units, rooms].sum(axis=1)
+        shift_mismatches = self.shift_mismatch[self.units, self.code_slot[codes]].sum(axis=1)
+        slots = self.code_slot[codes]
+        teacher_clashes = self._clashes(self.unit_teacher_base + self.code_day_slot[codes], slots, self.n_teacher_keys, 1,
+                                        self.existing_teacher, self.existing_teacher_overlaps)
+        room_clashes = self._clashes(codes, slots, max(enc.n_codes, 1), enc.n_rooms,
+                                     self.existing_room, self.existing_room_overlaps)
+
+        score = n_genes * 100 - room_mismatches * 500 - (teacher_clashes + room_clashes) * 50 - shift_mismatches * 30
+        moved = ((codes != self.unit_previous) & (self.unit_previous >= 0)).sum(axis=1)
+        score -= moved * enc.move_penalty
+
+        room_use = np.bincount((rooms + rows * enc.n_rooms).ravel(), minlength=n_pop * enc.n_rooms)
+        room_use = room_use.reshape(n_pop, enc.n_rooms)
+        used = room_use > 0
+        lecture_halls_used = (used & self.is_lecture_hall).sum(axis=1)
+        labs_used = (used & self.is_lab).sum(axis=1)
+        score -= (np.maximum(lecture_halls_used - 1, 0) + np.maximum(labs_used - 1, 0)) * 5
+
+        total_rooms_used = lecture_halls_used + labs_used
+        score += np.select(
+            [total_rooms_used == 1, total_rooms_used == 2, total_rooms_used == 3, total_rooms_used <= 4],
+            [50, 30, 15, 5], 0
+        )
+
+        # Balanced room filling in integers (see FitnessState.score)
+        rooms_used = used.sum(axis=1)
+        deviation = (np.abs(rooms_used[:, None] * room_use - n_genes) * used).sum(axis=1)
+        score += np.where((rooms_used > 0) & (deviation < rooms_used * rooms_used), 100, 0)
+        inexact_ties = (deviation == rooms_used * rooms_used) & ((rooms_used & (rooms_used - 1)) != 0)
+
+        # Day balance, summed day by day in the same order as encoded_fitness
+        day_counts = np.bincount((self.code_day[codes] + rows * enc.n_days).ravel(), minlength=n_pop * enc.n_days)
+        day_deviation = np.abs(day_counts.reshape(n_pop, enc.n_days) - n_genes / enc.n_days)
+        balance_penalty = day_deviation[:, 0].copy()
+        for day in range(1, enc.n_days):
+            balance_penalty += day_deviation[:, day]
+
+        fitness = score.astype(np.float64) - balance_penalty * 2
+        if n_genes == enc.n_courses:
+            fitness += 500
+        fitness = np.maximum(fitness, 0)
+
+        # Rows on an exact balance tie depend on float summation order, score them directly
+        for row in np.flatnonzero(inexact_ties):
+            fitness[row] = self.scheduler.calculate_encoded_fitness(array('i', matrix[row].tolist()))
+
+        return fitness
+
+def chromosome_fingerprint(chromosome):
+    """Cheap order-insensitive hash of a chromosome's (unit, code) assignments"""
+    return sum(map(hash, enumerate(chromosome))) & 0xFFFFFFFFFFFFFFFF
+
+def population_diversity(chromosomes, reference, sample_size=16):
+    """Mean share of genes that differ from reference, over an evenly spaced sample
+
+    0.0 means the sample has converged onto reference. Sampling keeps this cheap
+    enough to run every generation on large floors.
+    """
+    step = max(1, len(chromosomes) // sample_size)
+    sample = [chromo for chromo in chromosomes[::step] if chromo is not reference][:sample_size]
+    if not sample or not reference:
+        return 0.0
+    return sum(sum(map(operator.ne, reference, chromo)) for chromo in sample) / (len(sample) * len(reference))
+
+class FitnessCache:
+    """Bounded LRU memo of fitness scores keyed by chromosome fingerprint
+
+    Entries keep the chromosome itself so a fingerprint collision can never
+    return another chromosome's score.
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, fingerprint, chromosome):
+        entry = self.entries.get(fingerprint)
+        if entry is not None and entry[0] == chromosome:
+            self.entries.move_to_end(fingerprint)
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        return None
+
+    def put(self, fingerprint, chromosome, fitness):
+        self.entries[fingerprint] = (chromosome, fitness)
+        self.entries.move_to_end(fingerprint)
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+# Problem data held by each fitness worker process, installed once per solve
+_worker_encoding = None
+
+def _init_fitness_worker(encoding):
+    global _worker_encoding
+    _worker_encoding = encoding
+
+def _unpack_chromosomes(packed, n_genes):
+    """Split int32 bytes holding chromosomes back to back into arrays"""
+    genes = array('i')
+    genes.frombytes(packed)
+    return [genes[i:i + n_genes] for i in range(0, len(genes), n_genes)]
+
+def _score_packed_chromosomes(payload):
+    """Pool task: score a block of packed chromosomes"""
+    n_genes, packed = payload
+    return [encoded_fitness(_worker_encoding, chromo) for chromo in _unpack_chromosomes(packed, n_genes)]
+
+# Scheduler configured for one island, installed once per island worker process
+_island_scheduler = None
+
+def _init_island_worker(scheduler):
+    global _island_scheduler
+    _island_scheduler = scheduler
+
+def _run_island_epoch(payload):
+    """Pool task: evolve one island for a number of generations
+
+    Returns the island population sorted best-first (packed), its fitness
+    scores, the island's random state for the next epoch and the epoch's
+    evaluation/cache counters.
+    """
+    n_genes, packed, generations, random_state = payload
+    scheduler = _island_scheduler
+    scheduler.rng.setstate(random_state)
+    scheduler.stats = {'evaluations': 0, 'phase_times': dict.fromkeys(GA_PHASES, 0.0)}
+    if scheduler.fitness_cache is not None:
+        scheduler.fitness_cache.hits = scheduler.fitness_cache.misses = 0
+        scheduler.stats.update(cache_hits=0, cache_misses=0)
+
+    population = [(chromo, None) for chromo in _unpack_chromosomes(packed, n_genes)]
+    for _ in range(generations):
+        fitness_scores = scheduler.evaluate_sorted(population)
+        population = scheduler.breed_population(fitness_scores)
+
+    fitness_scores = scheduler.evaluate_sorted(population)
+    scheduler._record_cache_stats()
+    return (b''.join(chromo for chromo, _, _ in fitness_scores),
+            [fitness for _, _, fitness in fitness_scores],
+            scheduler.rng.getstate(),
+            scheduler.stats)
+
+# Genetic Algorithm for Timetable Scheduling
+class TimetableScheduler:
+    def __init__(self, courses, rooms, floor_number):
+        self.courses = courses
+        self.rooms = rooms  # List of room dictionaries with room_number and type
+        self.floor_number = floor_number
+        self.population_size = 200
+        self.generations = 1000
+        self.mutation_rate = 0.15
+        self.crossover_rate = 0.85
+        self.crossover_operator = 'block'  # 'block' (whole room-days from parent2), 'uniform' or 'single_point'
+        self.repair_attempts = 20  # Random placements tried per clashing child gene, 0 disables repair
+        self.elite_size = int(0.1 * self.population_size)
+        self.diversity_threshold = 0.02  # Below this population_diversity() the population has collapsed
+        self.restart_patience = 20  # Generations without a new best before a collapsed population is restarted
+        self.near_perfect_share = 0.95  # Stop once the best fitness reaches this share of 100 points per course
+        self.max_restarts = 3  # Fruitless restarts in a row before giving up, 0 disables restarts (single population)
+        self.restart_mutation_share = 0.02  # Share of genes mutated in the chromosomes a restart re-seeds
+        self.existing_schedules = []  # Will be set externally if needed
+        self.teacher_busy = {}  # {(teacher_name, day): minute bitmask} taught elsewhere (TeacherOccupancy)
+        self.previous_schedule = []  # Current placements (scheduled_classes) to warm-start from and stay close to
+        self.move_penalty = 40  # Points per section moved away from previous_schedule (an int, below a clash)
+        self.encoding = None  # ProblemEncoding, built when evolve() starts
+        self.seeding = 'dsatur'  # Initial population: 'dsatur' (graph colouring) or 'sequential'
+        # 'incremental' (FitnessState deltas, fastest), 'batch' (numpy, whole population) or 'full'
+        # (plain Python, whole population). The whole-population modes use the fitness cache;
+        # prefer 'batch' to 'full' when numpy is installed
+        self.fitness_mode = 'incremental'
+        self.batch_evaluator = None  # BatchFitnessEvaluator, built when evolve() starts in 'batch' mode
+        self.delta_max_fraction = 0.5  # Rescore children that differ from both parents in more genes
+        self.workers = 0  # > 0 scores each generation on a process pool (full evaluation)
+        self.pool_start_method = None  # multiprocessing start method, None = platform default
+        self.pool = None
+        # LRU entries for full evaluations, 0 disables the cache. Only the 'batch' and 'full' fitness
+        # modes and the worker pool do full evaluations; 'incremental' runs have no cache or cache stats
+        self.fitness_cache_size = 4096
+        self.fitness_cache = None
+        self.stats = {}  # Run statistics of the last evolve(), see evolve()
+        self.progress_callback = None  # Called with each generation's record as it is added to stats['history']
+        self.trace_memory = False  # Record peak traced memory in stats (tracemalloc, slows the run down)
+        self.run_started = None  # perf_counter() at the start of the current evolve()
+        self.checkpoint_path = None  # File the solve saves its state to every checkpoint_interval and resumes from
+        self.checkpoint_interval = 30  # Seconds between checkpoints
+        self.checkpoint_saved = None  # perf_counter() of the last checkpoint
+        self.islands = 1  # > 1 evolves that many sub-populations in separate processes
+        self.migration_interval = 25  # Generations between migrations
+        self.migration_size = 2  # Best chromosomes each island sends per migration
+        self.migration_topology = 'ring'  # 'ring' or 'random'
+        self.seed = None  # RNG seed of the next solve, None draws a fresh one (see stats['seed'])
+        self.rng = random.Random()  # This instance's random stream, reset by seed_rng()
+
+    def seed_rng(self):
+        """Start the solve's random stream from self.seed, recording it in stats['seed']"""
+        seed = self.seed if self.seed is not None else draw_seed()
+        self.rng = random.Random(seed)
+        self.stats['seed'] = seed
+        return seed
+
+    def spawn_rng(self):
+        """Independent child stream (islands, sub-problems), derived from this one"""
+        return random.Random(self.rng.getrandbits(64))
+
+    def checkpoint_fingerprint(self):
+        """Digest of the problem a checkpoint belongs to: solver, sections, rooms, preserved classes and fixed time"""
+        enc = self.encoding
+        problem = (
+            type(self).__name__,
+            self.population_size,
+            self.islands,
+            [(str(course.get('_id')), course.get('section_code'), course.get('teacher_name'), course.get('shift'),
+              course.get('course_type'), course.get('credit_hour')) for course in enc.units],
+            [(str(room.get('room_number')), room.get('type')) for room in enc.rooms],
+            sorted(self.teacher_busy.items()),
+            sorted((str(existing.get('teacher_name')), str(existing.get('room_number')), str(existing.get('day')),
+                    str(existing.get('start_time')), str(existing.get('end_time')))
+                   for existing in self.existing_schedules),
+            list(enc.unit_previous),
+        )
+        return hashlib.sha256(repr(problem).encode()).hexdigest()
+
+    def checkpoint_due(self):
+        if self.checkpoint_path is None:
+            return False
+        if self.checkpoint_saved is None:
+            self.checkpoint_saved = time.perf_counter()
+        return time.perf_counter() - self.checkpoint_saved >= self.checkpoint_interval
+
+    def save_checkpoint(self, state):
+        """Write the solver's state (a dict) to checkpoint_path, with the RNG state and stats
+
+        The file is replaced atomically, so a worker killed mid-write leaves the
+        previous checkpoint intact.
+        """
+        state = dict(state, version=CHECKPOINT_VERSION, fingerprint=self.checkpoint_fingerprint(),
+                     rng_state=self.rng.getstate(), stats=self.stats)
+        temporary_path = f'{self.checkpoint_path}.tmp'
+        with open(temporary_path, 'wb') as checkpoint_file:
+            checkpoint_file.write(zlib.compress(pickle.dumps(state, pickle.HIGHEST_PROTOCOL)))
+        os.replace(temporary_path, self.checkpoint_path)
+        self.checkpoint_saved = time.perf_counter()
+
+    def load_checkpoint(self):
+        """State saved by an interrupted solve of this problem, or None
+
+        Restores the RNG state and stats, so the resumed solve continues exactly
+        where the checkpoint was taken. Checkpoints of another problem, solver or
+        format are ignored.
+        """
+        self.checkpoint_saved = None
+        if self.checkpoint_path is None or not os.path.exists(self.checkpoint_path):
+            return None
+        try:
+            with open(self.checkpoint_path, 'rb') as checkpoint_file:
+                state = pickle.loads(zlib.decompress(checkpoint_file.read()))
+        except (OSError, zlib.error, pickle.UnpicklingError, EOFError) as error:
+            print(f"⚠️  Ignoring unreadable checkpoint {self.checkpoint_path}: {error}")
+            return None
+        if state.get('version') != CHECKPOINT_VERSION or state.get('fingerprint') != self.checkpoint_fingerprint():
+            print(f"Ignoring checkpoint {self.checkpoint_path}: it belongs to a different problem")
+            return None
+
+        self.rng.setstate(state['rng_state'])
+        self.stats.update(state['stats'])
+        print(f"Resuming from checkpoint {self.checkpoint_path}")
+        return state
+
+    def clear_checkpoint(self):
+        """Remove the checkpoint once the solve has finished"""
+        if self.checkpoint_path is not None and os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
+
+    def build_encoding(self):
+        """ProblemEncoding of the courses, rooms, preserved classes and blocked time"""
+        return ProblemEncoding(self.courses, self.rooms, self.existing_schedules, self.teacher_busy,
+                               self.previous_schedule, self.move_penalty)
+
+    def previous_placements(self):
+        """{(course_id, section_code): (day, time_slot, room_number)} of previous_schedule
+
+        Only placements the solver could reproduce count (a known day and time
+        slot, a room of this solve).
+        """
+        time_slots = {time_slot for slot_types in TIME_SLOTS.values() for slots in slot_types.values()
+                      for time_slot in slots}
+        room_numbers = {str(room.get('room_number')) for room in self.rooms}
+        placements = {}
+        for placed in self.previous_schedule:
+            time_slot = (placed.get('start_time'), placed.get('end_time'))
+            room_number = str(placed.get('room_number'))
+            if placed.get('day') in DAYS_OF_WEEK and time_slot in time_slots and room_number in room_numbers:
+                placements[(str(placed.get('course_id')), placed.get('section_code'))] = (
+                    placed.get('day'), time_slot, room_number)
+        return placements
+
+    def create_encoded_chromosome(self):
+        """Create an integer chromosome with SMART sequential room filling
+
+        Labs are filled one at a time, fullest day first; lecture halls one at a
+        time, Monday first. Each course takes the first free slot of its shift,
+        falling back to a random placement when every room is full.
+        """
+        enc = self.encoding
+
+        # Log skipped courses on first chromosome creation
+        if enc.skipped_courses and not hasattr(self, '_logged_skipped'):
+            self._logged_skipped = True
+            print(f"\n⚠️  WARNING: {len(enc.skipped_courses)} courses skipped during chromosome creation:")
+            for skip in enc.skipped_courses[:10]:  # Show first 10
+                print(f"    - {skip}")
+            if len(enc.skipped_courses) > 10:
+                print(f"    ... and {len(enc.skipped_courses) - 10} more")
+            print()
+
+        grid = OccupancyGrid(enc.n_rooms, enc.n_days, enc.slot_overlap_mask)
+        all_days = range(enc.n_days)
+        # Rooms before first_open[(room_type, slot_mask)] have no free slot left for that mask
+        first_open = {}
+        chromosome = array('i', bytes(4 * len(enc.units)))
+
+        for unit in range(len(enc.units)):
+            slot_mask = enc.unit_slot_mask[unit]
+            rooms = enc.unit_rooms[unit]
+            fill_fullest_day = enc.unit_room_type[unit] == 'Lab'
+            pointer_key = (enc.unit_room_type[unit], slot_mask)
+
+            code = None
+            position = first_open.get(pointer_key, 0)
+            while position < len(rooms):
+                room = rooms[position]
+                days = grid.days_by_fill(room) if fill_fullest_day else all_days
+                for day in days:
+                    slot = grid.first_free_slot(room, day, slot_mask)
+                    if slot >= 0:
+                        grid.occupy(room, day, slot)
+                        code = enc.pack(day, slot, room)
+                        break
+                if code is not None:
+                    break
+                position += 1
+                first_open[pointer_key] = position
+
+            # If couldn't place (all slots full), fall back to random
+            if code is None:
+                code = enc.pack(self.rng.randrange(enc.n_days),
+                                self.rng.choice(enc.unit_slots[unit]),
+                                self.rng.choice(rooms))
+            chromosome[unit] = code
+
+        return chromosome
+
+    def create_dsatur_chromosome(self, keep_previous=False):
+        """Create a near-conflict-free chromosome by DSatur-style graph colouring
+
+        Sections sharing a teacher form the conflict graph and (day, slot) pairs
+        are the colours. The next section placed is always the one whose teacher
+        has the fewest free slots left in its shift (ties: busiest teacher, then
+        random), and it takes a slot where both its teacher and a room are free.
+        Rooms are still filled one at a time to keep room usage low. Random tie
+        breaking keeps the seeds of a population diverse.
+
+        With keep_previous, sections of previous_schedule stay where they are
+        and only the others are coloured around them (warm start). A previous
+        placement that no longer fits (another room type or shift, or a clash
+        with the placements kept before it) is coloured again too, and kept
+        only when no clash-free slot is left for it.
+        """
+        enc = self.encoding
+        n_days = enc.n_days
+        grid = OccupancyGrid(enc.n_rooms, n_days, enc.slot_overlap_mask)
+
+        # Preserved classes block their teacher's and room's slots
+        teacher_busy = [0] * (len(enc.teacher_index) * n_days)  # (teacher, day) -> slot bits
+        for index, blocked in enc.existing_teacher_blocked.items():
+            teacher_busy[index] |= blocked
+        for index, blocked in enc.existing_room_blocked.items():
+            grid.busy[index] |= blocked
+
+        def free_options(unit):
+            base = enc.unit_teacher[unit] * n_days
+            mask = enc.unit_slot_mask[unit]
+            return sum((mask & ~teacher_busy[base + day]).bit_count() for day in range(n_days))
+
+        teacher_units = {}
+        for unit, teacher in enumerate(enc.unit_teacher):
+            teacher_units.setdefault(teacher, []).append(unit)
+        remaining_load = {teacher: len(units) for teacher, units in teacher_units.items()}
+
+        chromosome = array('i', bytes(4 * len(enc.units)))
+        placed = [False] * len(enc.units)
+        released = {}  # {unit: previous code} of previous placements coloured again
+        if keep_previous:
+            for unit, code in enumerate(enc.unit_previous):
+                if code < 0:
+                    continue
+                teacher = enc.unit_teacher[unit]
+                room, day, slot = enc.code_room[code], enc.code_day[code], enc.code_slot[code]
+                if (enc.room_types[room] != enc.unit_room_type[unit]
+                        or not enc.unit_slot_mask[unit] >> slot & 1
+                        or (teacher_busy[teacher * n_days + day] | grid.busy[room * n_days + day]) >> slot & 1):
+                    released[unit] = code
+                    continue
+                grid.occupy(room, day, slot)
+                teacher_busy[teacher * n_days + day] |= enc.slot_overlap_mask[slot]
+                chromosome[unit] = code
+                placed[unit] = True
+                remaining_load[teacher] -= 1
+
+        heap = [(free_options(unit), -remaining_load[enc.unit_teacher[unit]], self.rng.random(), unit)
+                for unit in range(len(enc.units)) if not placed[unit]]
+        heapq.heapify(heap)
+        first_open = {}  # Rooms before the pointer are full for that slot mask
+
+        while heap:
+            options, _, _, unit = heapq.heappop(heap)
+            if placed[unit] or options != free_options(unit):
+                continue  # Stale entry, a fresher one is in the heap
+
+            teacher = enc.unit_teacher[unit]
+            slot_mask = enc.unit_slot_mask[unit]
+            rooms = enc.unit_rooms[unit]
+            fill_fullest_day = enc.unit_room_type[unit] == 'Lab'
+            pointer_key = (enc.unit_room_type[unit], slot_mask)
+
+            code = None
+            fallback = None  # Free room slot that clashes with the teacher
+            position = first_open.get(pointer_key, 0)
+            for room in rooms[position:]:
+                if fill_fullest_day:
+                    base = room * n_days
+                    days = sorted(range(n_days), key=lambda day: (-grid.fill[base + day], self.rng.random()))
+                else:
+                    days = range(n_days)
+                room_full = True
+                for day in days:
+                    room_free = slot_mask & ~grid.busy[room * n_days + day]
+                    if not room_free:
+                        continue
+                    room_full = False
+                    free = room_free & ~teacher_busy[teacher * n_days + day]
+                    if free:
+                        code = enc.pack(day, (free & -free).bit_length() - 1, room)
+                        break
+                    if fallback is None:
+                        fallback = enc.pack(day, (room_free & -room_free).bit_length() - 1, room)
+                if code is not None:
+                    break
+                if room_full and first_open.get(pointer_key, 0) == position:
+                    position += 1
+                    first_open[pointer_key] = position
+
+            if code is None:
+                code = released.get(unit, fallback)
+            if code is None:
+                code = enc.pack(self.rng.randrange(n_days), self.rng.choice(enc.unit_slots[unit]), self.rng.choice(rooms))
+            else:
+                grid.occupy(enc.code_room[code], enc.code_day[code], enc.code_slot[code])
+
+            chromosome[unit] = code
+            placed[unit] = True
+            teacher_busy[teacher * n_days + enc.code_day[code]] |= enc.slot_overlap_mask[enc.code_slot[code]]
+
+            # Placing a section saturates the other sections of the same teacher
+            remaining_load[teacher] -= 1
+            for other in teacher_units[teacher]:
+                if not placed[other]:
+                    heapq.heappush(heap, (free_options(other), -remaining_load[teacher], self.rng.random(), other))
+
+        return chromosome
+
+    def create_seed_chromosome(self):
+        """Initial population member, built by the configured seeding strategy
+
+        A previous_schedule always warm-starts: its sections keep their places.
+        """
+        if self.previous_schedule:
+            return self.create_dsatur_chromosome(keep_previous=True)
+        if self.seeding == 'dsatur':
+            return self.create_dsatur_chromosome()
+        return self.create_encoded_chromosome()
+
+    def calculate_encoded_fitness(self, chromosome):
+        """Score an integer chromosome (see encoded_fitness)"""
+        return encoded_fitness(self.encoding, chromosome)
+
+    def pick_crossover_units(self, parent1, parent2):
+        """Roll the crossover rate and pick the units the child takes from parent2
+
+        Returns None when the child is a plain copy of parent1. 'block' hands
+        over whole (room, day) timetables of parent2: the units parent2 places
+        there and the units parent1 placed there, which make room for them.
+        """
+        if self.rng.random() > self.crossover_rate:
+            return None
+
+        length = len(parent1)
+        if length <= 1:
+            return None
+
+        if self.crossover_operator == 'single_point':
+            return range(self.rng.randint(1, length - 1), length)
+
+        if self.crossover_operator == 'block':
+            enc = self.encoding
+            code_block = enc.code_block
+            chosen = {block for block in {code_block[code] for code in parent2} if self.rng.random() < 0.5}
+            return [unit for unit in range(length)
+                    if code_block[parent2[unit]] in chosen or code_block[parent1[unit]] in chosen]
+
+        return [unit for unit in range(length) if self.rng.random() < 0.5]
+
+    def repair_child(self, child, state, changed, other_parent):
+        """Move inherited genes that clash to a clash-free placement, in place
+
+        Each clashing gene in changed first tries its value in other_parent, then
+        up to repair_attempts random placements within its own rooms and time
+        slots. Genes with no clash-free option keep the inherited value.
+        """
+        enc = self.encoding
+        for unit in changed:
+            code = child[unit]
+            if not state.in_conflict(unit, code):
+                continue
+            for attempt in range(self.repair_attempts + 1):
+                if attempt == 0:
+                    new_code = other_parent[unit]
+                else:
+                    new_code = enc.pack(self.rng.randrange(enc.n_days), self.rng.choice(enc.unit_slots[unit]),
+                                        self.rng.choice(enc.unit_rooms[unit]))
+                if new_code == code:
+                    continue
+                state.move(unit, code, new_code)
+                if not state.in_conflict(unit, new_code):
+                    child[unit] = new_code
+                    break
+                state.move(unit, new_code, code)
+
+    def cross_encoded(self, parent1, parent2, state1=None, state2=None):
+        """Crossover of two integer chromosomes, returning (child, state)
+
+        Genes are aligned by schedulable unit, so the child always has exactly one
+        gene per section. The child is built on the parent it shares more genes
+        with, replaying the others into a copy of that parent's FitnessState;
+        children that differ too much get no state (or a fresh one for repair).
+        A chromosome identical to a parent is returned as that parent.
+        """
+        units = self.pick_crossover_units(parent1, parent2)
+        if units is None:
+            return parent1, state1
+
+        child = array('i', parent1)
+        for unit in units:
+            child[unit] = parent2[unit]
+        length = len(child)
+        changed1 = [unit for unit in range(length) if child[unit] != parent1[unit]]
+        changed2 = [unit for unit in range(length) if child[unit] != parent2[unit]]
+        if len(changed1) <= len(changed2):
+            base, other, state, changed = parent1, parent2, state1, changed1
+        else:
+            base, other, state, changed = parent2, parent1, state2, changed2
+        if not changed:
+            return base, state
+
+        if state is not None and len(changed) <= self.delta_max_fraction * length:
+            state = state.copy()
+            for unit in changed:
+                state.move(unit, base[unit], child[unit])
+        else:
+            state = None
+
+        if self.repair_attempts > 0:
+            if state is None:
+                state = FitnessState(self.encoding, child)
+            self.repair_child(child, state, changed, base)
+
+        return child, state
+
+    def pick_mutation(self, chromosome):
+        """Roll the mutation rate and pick a (unit, new_code) change, or None"""
+        if self.rng.random() > self.mutation_rate:
+            return None
+        return self.pick_random_change(chromosome)
+
+    def pick_random_change(self, chromosome):
+        """A (unit, new_code) change moving one random gene to another day, time or room, or None"""
+        if not chromosome:
+            return None
+
+        enc = self.encoding
+        unit = self.rng.randrange(len(chromosome))
+        code = chromosome[unit]
+        day, slot, room = enc.code_day[code], enc.code_slot[code], enc.code_room[code]
+
+        mutation_type = self.rng.choice(['day', 'time', 'room'])
+
+        if mutation_type == 'day':
+            day = self.rng.randrange(enc.n_days)
+        elif mutation_type == 'time':
+            slot = self.rng.choice(enc.unit_slots[unit])
+        elif mutation_type == 'room':
+            valid_rooms = enc.unit_rooms[unit]
+            if valid_rooms:
+                # 95% first-room concentration bias, like the seed chromosomes
+                if self.rng.random() < 0.95:
+                    room = valid_rooms[0]
+                else:
+                    room = self.rng.choice(valid_rooms)
+
+        return unit, enc.pack(day, slot, room)
+
+    def breed_encoded(self, parent1, parent2):
+        """Crossover + mutation on (chromosome, state) pairs, deriving the child's state
+
+        Only the genes that differ from the closer parent are replayed into a copy
+        of that parent's FitnessState (see cross_encoded). Children without a
+        state fall back to a full evaluation later.
+        """
+        chromo1, state1 = parent1
+        chromo2, state2 = parent2
+        started = time.perf_counter()
+        child, state = self.cross_encoded(chromo1, chromo2, state1, state2)
+        crossed = time.perf_counter()
+
+        change = self.pick_mutation(child)
+        if change is not None:
+            unit, code = change
+            old_code = child[unit]
+            child = array('i', child)
+            child[unit] = code
+            if state is not None and old_code != code:
+                state = state.copy()
+                state.move(unit, old_code, code)
+
+        phase_times = self._phase_times()
+        phase_times['crossover'] += crossed - started
+        phase_times['mutation'] += time.perf_counter() - crossed
+        return child, state
+
+    def evaluate_encoded(self, population):
+        """Score (chromosome, state) pairs, building states where missing
+
+        Returns a list of (chromosome, state, fitness) triples. Outside the
+        incremental mode, chromosomes already scored (elites, unchanged
+        copies of a parent) are answered from the fitness cache.
+        """
+        if self.pool is None and self.fitness_mode == 'incremental':
+            scored = []
+            for chromo, state in population:
+                if state is None:
+                    state = FitnessState(self.encoding, chromo)
+                scored.append((chromo, state, state.score(chromo)))
+            self.stats['evaluations'] += len(population)
+            return scored
+
+        chromosomes = [chromo for chromo, _ in population]
+        scores = [None] * len(chromosomes)
+        pending = list(range(len(chromosomes)))
+        cache = self.fitness_cache
+        if cache is not None:
+            fingerprints = [chromosome_fingerprint(chromo) for chromo in chromosomes]
+            pending = []
+            duplicates = []
+            first_seen = {}  # Copies within this generation are scored once
+            for i, chromo in enumerate(chromosomes):
+                original = first_seen.setdefault(fingerprints[i], i)
+                if original != i and chromosomes[original] == chromo:
+                    duplicates.append((i, original))
+                    cache.hits += 1
+                    continue
+                scores[i] = cache.get(fingerprints[i], chromo)
+                if scores[i] is None:
+                    pending.append(i)
+
+        if pending:
+            new_scores = self._score_chromosomes([chromosomes[i] for i in pending])
+            for i, fitness in zip(pending, new_scores):
+                scores[i] = fitness
+                if cache is not None:
+                    cache.put(fingerprints[i], chromosomes[i], fitness)
+            self.stats['evaluations'] += len(pending)
+
+        if cache is not None:
+            for i, original in duplicates:
+                scores[i] = scores[original]
+
+        return [(chromo, None, fitness) for chromo, fitness in zip(chromosomes, scores)]
+
+    def _score_chromosomes(self, chromosomes):
+        """Full fitness evaluation on the pool, numpy or plain Python"""
+        if self.pool is not None:
+            # Ship only the packed genes; workers already hold the problem data
+            n_genes = len(chromosomes[0])
+            block = -(-len(chromosomes) // (self.workers * 4))
+            payloads = [(n_genes, b''.join(chromosomes[i:i + block])) for i in range(0, len(chromosomes), block)]
+            return [fitness for scores in self.pool.map(_score_packed_chromosomes, payloads) for fitness in scores]
+
+        if self.fitness_mode == 'batch':
+            return self.batch_evaluator.evaluate(self.batch_evaluator.population_matrix(chromosomes)).tolist()
+
+        return [self.calculate_encoded_fitness(chromo) for chromo in chromosomes]
+
+    def _phase_times(self):
+        """stats['phase_times'], also when operators are called outside evolve()"""
+        return self.stats.setdefault('phase_times', dict.fromkeys(GA_PHASES, 0.0))
+
+    def evaluate_sorted(self, population):
+        """evaluate_encoded() sorted best-first, timing the fitness and selection phases"""
+        phase_times = self._phase_times()
+        started = time.perf_counter()
+        fitness_scores = self.evaluate_encoded(population)
+        scored = time.perf_counter()
+        fitness_scores.sort(key=lambda x: x[2], reverse=True)
+        phase_times['fitness'] += scored - started
+        phase_times['selection'] += time.perf_counter() - scored
+        return fitness_scores
+
+    def record_generation(self, generation, chromosomes, fitnesses):
+        """Add a generation's record to stats['history'] and pass it to progress_callback
+
+        Records hold the best/mean/worst fitness, the population diversity (see
+        population_diversity), the evaluations so far and the seconds elapsed.
+        """
+        best = max(range(len(fitnesses)), key=fitnesses.__getitem__)
+        record = {
+            'generation': generation,
+            'best': fitnesses[best],
+            'mean': sum(fitnesses) / len(fitnesses),
+            'worst': min(fitnesses),
+            'diversity': population_diversity(chromosomes, chromosomes[best]),
+            'evaluations': self.stats['evaluations'],
+            'elapsed': time.perf_counter() - self.run_started,
+        }
+        self.stats['history'].append(record)
+        if self.progress_callback is not None:
+            self.progress_callback(record)
+        return record
+
+    def evolve(self):
+        """Run the genetic algorithm on integer-encoded chromosomes
+
+        Only the winning chromosome is decoded back into gene dicts. Alongside
+        the counters, self.stats holds the seconds spent in each of GA_PHASES
+        ('phase_times', summed over islands), one record per generation
+        ('history', see record_generation), 'elapsed', 'evaluations_per_second'
+        and, with trace_memory, 'peak_traced_memory' in bytes (this process only).
+        """
+        self.run_started = time.perf_counter()
+        started_tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        elif self.trace_memory:
+            tracemalloc.reset_peak()
+
+        self.stats = {'generations': 0, 'best_generation': 0, 'evaluations': 0,
+                      'restarts': 0, 'phase_times': dict.fromkeys(GA_PHASES, 0.0), 'history': []}
+        try:
+            self.encoding = self.build_encoding()
+            self.seed_rng()
+            if self.fitness_mode == 'batch':
+                if np is None:
+                    print("⚠️  numpy is not installed, falling back to incremental fitness")
+                    self.fitness_mode = 'incremental'
+                else:
+                    self.batch_evaluator = BatchFitnessEvaluator(self)
+            self.fitness_cache = None
+            if self.fitness_cache_size > 0 and self.does_full_evaluations():
+                self.fitness_cache = FitnessCache(self.fitness_cache_size)
+                self.stats.update(cache_hits=0, cache_misses=0)
+            self.stats['phase_times']['construction'] += time.perf_counter() - self.run_started
+
+            if self.islands > 1:
+                result = self._run_islands()
+            else:
+                self.start_worker_pool()
+                try:
+                    result = self._run_generations()
+                finally:
+                    self.stop_worker_pool()
+            self.clear_checkpoint()
+            return result
+        finally:
+            elapsed = time.perf_counter() - self.run_started
+            self.stats['elapsed'] = elapsed
+            self.stats['evaluations_per_second'] = self.stats['evaluations'] / elapsed if elapsed > 0 else 0.0
+            self.stats['peak_traced_memory'] = tracemalloc.get_traced_memory()[1] if self.trace_memory else None
+            if started_tracing:
+                tracemalloc.stop()
+
+    def solve(self):
+        """Solver backend interface (see solvers.py): (best_schedule, fitness)"""
+        return self.evolve()
+
+    def start_worker_pool(self):
+        """Start the fitness worker pool and ship the problem data to it once"""
+        if self.workers <= 0:
+            return
+        context = multiprocessing.get_context(self.pool_start_method)
+        self.pool = context.Pool(self.workers, initializer=_init_fitness_worker, initargs=(self.encoding,))
+        print(f"Evaluating fitness on {self.workers} worker processes")
+
+    def stop_worker_pool(self):
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool.join()
+            self.pool = None
+
+    def initial_population(self, size):
+        """Create (chromosome, state) pairs, or None when no course can be placed"""
+        print(f"Creating initial population of {size} chromosomes...")
+        started = time.perf_counter()
+        population = [(self.create_seed_chromosome(), None) for _ in range(size)]
+        self._phase_times()['construction'] += time.perf_counter() - started
+
+        # Debug: Check first chromosome
+        if population and len(population) > 0:
+            first_chromosome = population[0][0]
+            print(f"First chromosome has {len(first_chromosome)} genes (courses scheduled)")
+            if len(first_chromosome) == 0:
+                print("❌ ERROR: Chromosomes are empty! No courses being added to schedule.")
+                return None
+            elif len(first_chromosome) < len(self.courses):
+                print(f"⚠️  WARNING: Only {len(first_chromosome)}/{len(self.courses)} courses in chromosome")
+
+        return population
+
+    def breed_population(self, fitness_scores):
+        """Next generation from a fitness-sorted list: elites plus bred children"""
+        # Selection: Keep elite
+        new_population = [(chromo, state) for chromo, state, _ in fitness_scores[:self.elite_size]]
+
+        # Crossover and mutation
+        phase_times = self._phase_times()
+        while len(new_population) < self.population_size:
+            # Tournament selection
+            started = time.perf_counter()
+            parent1 = self.rng.choice(fitness_scores[:50])
+            parent2 = self.rng.choice(fitness_scores[:50])
+            phase_times['selection'] += time.perf_counter() - started
+
+            child = self.breed_encoded(parent1[:2], parent2[:2])
+
+            new_population.append(child)
+
+        return new_population
+
+    def restart_population(self, fitness_scores):
+        """Partial restart of a fitness-sorted population
+
+        Keeps the elites and re-seeds everyone else as an elite with
+        restart_mutation_share of its genes mutated. That restores diversity
+        around the good region at a fraction of the cost of new constructive
+        seeds, which start far below the elites and rarely survive.
+        """
+        started = time.perf_counter()
+        elites = fitness_scores[:max(self.elite_size, 1)]
+        population = [(chromo, state) for chromo, state, _ in elites]
+        n_mutations = max(1, int(self.restart_mutation_share * len(elites[0][0])))
+        while len(population) < self.population_size:
+            chromosome = array('i', self.rng.choice(elites)[0])
+            for _ in range(n_mutations):
+                change = self.pick_random_change(chromosome)
+                if change is not None:
+                    chromosome[change[0]] = change[1]
+            population.append((chromosome, None))
+        self._phase_times()['mutation'] += time.perf_counter() - started
+        self.stats['restarts'] += 1
+        return population
+
+    def does_full_evaluations(self):
+        """Whether evaluate_encoded() scores whole chromosomes (and consults the fitness cache)"""
+        return self.fitness_mode != 'incremental' or (self.workers > 0 and self.islands <= 1)
+
+    def _record_cache_stats(self):
+        if self.fitness_cache is not None:
+            self.stats['cache_hits'] = self.fitness_cache.hits
+            self.stats['cache_misses'] = self.fitness_cache.misses
+
+    def _run_generations(self):
+        checkpoint = self.load_checkpoint()
+        if checkpoint is not None:
+            population = [(chromo, None) for chromo in _unpack_chromosomes(checkpoint['population'], checkpoint['n_genes'])]
+            first_generation = checkpoint['generation']
+            best_fitness = checkpoint['best_fitness']
+            best_schedule = checkpoint['best_schedule']
+            generations_without_improvement = checkpoint['stagnant']
+            last_restart = checkpoint['last_restart']
+            fruitless_restarts = checkpoint['fruitless_restarts']
+        else:
+            population = self.initial_population(self.population_size)
+            if population is None:
+                return None, 0
+            first_generation = 0
+            best_fitness = 0
+            best_schedule = None
+            generations_without_improvement = 0
+            last_restart = 0
+            fruitless_restarts = 0  # Restarts since the last new best
+        max_stagnant_generations = 100  # Early termination if no improvement
+
+        for generation in range(first_generation, self.generations):
+            if self.checkpoint_due():
+                self.save_checkpoint({
+                    'generation': generation,
+                    'n_genes': len(population[0][0]),
+                    'population': b''.join(chromo for chromo, _ in population),
+                    'best_fitness': best_fitness,
+                    'best_schedule': best_schedule,
+                    'stagnant': generations_without_improvement,
+                    'last_restart': last_restart,
+                    'fruitless_restarts': fruitless_restarts,
+                })
+            self.stats['generations'] += 1
+
+            # Evaluate fitness
+            fitness_scores = self.evaluate_sorted(population)
+            record = self.record_generation(generation, [chromo for chromo, _, _ in fitness_scores],
+                                            [fitness for _, _, fitness in fitness_scores])
+
+            # Debug first generation
+            if generation == 0:
+                print(f"\nFirst generation fitness scores:")
+                print(f"  Best: {fitness_scores[0][2]}")
+                print(f"  Worst: {fitness_scores[-1][2]}")
+                print(f"  Average: {sum(f for _, _, f in fitness_scores) / len(fitness_scores):.1f}")
+                if fitness_scores[0][2] <= 0:
+                    print(f"  ❌ All fitness scores are ≤ 0! Severe penalties detected.")
+                print()
+
+            # Track best (chromosomes are never modified in place, no copy needed)
+            current_best_fitness = fitness_scores[0][2]
+            if current_best_fitness > best_fitness:
+                best_fitness = current_best_fitness
+                best_schedule = fitness_scores[0][0]
+                self.stats['best_generation'] = generation
+                generations_without_improvement = 0
+                fruitless_restarts = 0
+                print(f"Generation {generation}: Best fitness = {best_fitness}")
+            else:
+                generations_without_improvement += 1
+
+            # Check for perfect solution (no conflicts)
+            # Perfect = all courses scheduled with no penalties
+            # With new scoring: len(courses) * 100 - small penalties
+            expected_perfect_score = len(self.courses) * 100
+            if best_fitness >= expected_perfect_score * self.near_perfect_share:  # Allow small penalties
+                print(f"✓ Near-perfect solution found at generation {generation}!")
+                break
+
+            # Early termination if stuck
+            if generations_without_improvement >= max_stagnant_generations:
+                print(f"Early termination at generation {generation}: No improvement for {max_stagnant_generations} generations")
+                break
+
+            # If fitness is very low relative to courses, likely impossible
+            if generation > 50 and best_fitness < len(self.courses) * 20:
+                print(f"Early termination at generation {generation}: Fitness too low ({best_fitness}), likely impossible scenario")
+                break
+
+            # Collapsed population (near-clones of the best) that stopped improving: restart all but the elites
+            if (self.max_restarts > 0 and record['diversity'] < self.diversity_threshold
+                    and min(generations_without_improvement, generation - last_restart) >= self.restart_patience):
+                if fruitless_restarts >= self.max_restarts:
+                    print(f"Early termination at generation {generation}: No improvement after {fruitless_restarts} restarts")
+                    break
+                print(f"Generation {generation}: Population diversity {record['diversity']:.3f}, restarting all but the elites")
+                population = self.restart_population(fitness_scores)
+                last_restart = generation
+                fruitless_restarts += 1
+                continue
+
+            population = self.breed_population(fitness_scores)
+
+        self._record_cache_stats()
+
+        if best_schedule is None:
+            return None, best_fitness
+
+        return self.encoding.decode(best_schedule), best_fitness
+
+    def _run_islands(self):
+        """Island model: independent sub-populations in separate processes with periodic migration"""
+        n_islands = self.islands
+        island_size = max(self.population_size // n_islands, 2)
+
+        checkpoint = self.load_checkpoint()
+        if checkpoint is not None:
+            n_genes = checkpoint['n_genes']
+            islands = checkpoint['islands']
+            random_states = checkpoint['random_states']
+        else:
+            population = self.initial_population(n_islands * island_size)
+            if population is None:
+                return None, 0
+            n_genes = len(population[0][0])
+            islands = [
+                b''.join(chromo for chromo, _ in population[i * island_size:(i + 1) * island_size])
+                for i in range(n_islands)
+            ]
+            # Each island draws from its own random stream, whichever process runs it
+            random_states = [self.spawn_rng().getstate() for _ in range(n_islands)]
+
+        # The worker-side scheduler runs one island; problem data is shipped once per process
+        island_scheduler = copy.copy(self)
+        island_scheduler.population_size = island_size
+        island_scheduler.elite_size = max(1, int(0.1 * island_size))
+        island_scheduler.islands = 1
+        island_scheduler.workers = 0
+        island_scheduler.pool = None
+        island_scheduler.progress_callback = None  # Progress is reported here, once per epoch
+
+        n_processes = min(n_islands, self.workers) if self.workers > 0 else n_islands
+        context = multiprocessing.get_context(self.pool_start_method)
+        print(f"Running {n_islands} islands of {island_size} chromosomes on {n_processes} processes "
+              f"(migrating {self.migration_size} every {self.migration_interval} generations, {self.migration_topology} topology)")
+
+        best_fitness = checkpoint['best_fitness'] if checkpoint else 0
+        best_schedule = checkpoint['best_schedule'] if checkpoint else None
+        generations_without_improvement = checkpoint['stagnant'] if checkpoint else 0
+        max_stagnant_generations = 100  # Early termination if no improvement
+        generation = checkpoint['generation'] if checkpoint else 0
+
+        with context.Pool(n_processes, initializer=_init_island_worker, initargs=(island_scheduler,)) as pool:
+            while generation < self.generations:
+                if self.checkpoint_due():
+                    self.save_checkpoint({
+                        'generation': generation,
+                        'n_genes': n_genes,
+                        'islands': islands,
+                        'random_states': random_states,
+                        'best_fitness': best_fitness,
+                        'best_schedule': best_schedule,
+                        'stagnant': generations_without_improvement,
+                    })
+                epoch = min(self.migration_interval, self.generations - generation)
+                payloads = [(n_genes, islands[i], epoch, random_states[i]) for i in range(n_islands)]
+                results = pool.map(_run_island_epoch, payloads)
+                generation += epoch
+
+                # Each island comes back sorted best-first
+                island_chromosomes = []
+                for i, (packed, fitnesses, random_state, island_stats) in enumerate(results):
+                    random_states[i] = random_state
+                    island_chromosomes.append((_unpack_chromosomes(packed, n_genes), fitnesses))
+                    for key, value in island_stats.items():
+                        if key == 'phase_times':
+                            for phase, seconds in value.items():
+                                self.stats['phase_times'][phase] += seconds
+                        else:
+                            self.stats[key] += value
+
+                self.record_generation(generation,
+                                       [chromo for chromosomes, _ in island_chromosomes for chromo in chromosomes],
+                                       [fitness for _, fitnesses in island_chromosomes for fitness in fitnesses])
+
+                epoch_best = max(range(n_islands), key=lambda i: island_chromosomes[i][1][0])
+                current_best_fitness = island_chromosomes[epoch_best][1][0]
+                if current_best_fitness > best_fitness:
+                    best_fitness = current_best_fitness
+                    best_schedule = island_chromosomes[epoch_best][0][0]
+                    self.stats['best_generation'] = generation
+                    generations_without_improvement = 0
+                    print(f"Generation {generation}: Best fitness = {best_fitness} (island {epoch_best})")
+                else:
+                    generations_without_improvement += epoch
+
+                expected_perfect_score = len(self.courses) * 100
+                if best_fitness >= expected_perfect_score * self.near_perfect_share:  # Allow small penalties
+                    print(f"✓ Near-perfect solution found at generation {generation}!")
+                    break
+
+                if generations_without_improvement >= max_stagnant_generations:
+                    print(f"Early termination at generation {generation}: No improvement for {max_stagnant_generations} generations")
+                    break
+
+                if generation > 50 and best_fitness < len(self.courses) * 20:
+                    print(f"Early termination at generation {generation}: Fitness too low ({best_fitness}), likely impossible scenario")
+                    break
+
+                # Migration: each island's best replace the worst of its destination island
+                if self.migration_topology == 'random':
+                    destinations = [self.rng.choice([j for j in range(n_islands) if j != i]) for i in range(n_islands)]
+                else:
+                    destinations = [(i + 1) % n_islands for i in range(n_islands)]
+                migrant_count = min(self.migration_size, island_size - 1)
+                new_islands = [list(chromosomes) for chromosomes, _ in island_chromosomes]
+                for source, destination in enumerate(destinations):
+                    if migrant_count <= 0:
+                        break
+                    migrants = island_chromosomes[source][0][:migrant_count]
+                    new_islands[destination][-migrant_count:] = migrants
+                islands = [b''.join(chromosomes) for chromosomes in new_islands]
+
+        self.stats['generations'] = generation
+
+        if best_schedule is None:
+            return None, best_fitness
+
+        return self.encoding.decode(best_schedule), best_fitness
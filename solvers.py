@@ -0,0 +1,822 @@
+# Solver backends for the autogenerate routes: the genetic algorithm and single-trajectory local search
+import hashlib
+import json
+import math
+import multiprocessing
+import os
+import pickle
+import sys
+import time
+import zlib
+from array import array
+
+from scheduler import TimetableScheduler, FitnessState, encoded_fitness
+
+
+class LocalSearchSolver(TimetableScheduler):
+    """Base for single-trajectory solvers over the integer encoding
+
+    Starts from one constructive seed and walks the neighbourhood of "move one
+    section" (new day, time or room) and "swap two sections" (exchange the
+    placements of two sections that fit the same rooms and slots). Every step is
+    scored with FitnessState deltas, so memory stays at one chromosome instead of
+    a population.
+    """
+
+    def __init__(self, courses, rooms, floor_number):
+        super().__init__(courses, rooms, floor_number)
+        self.max_iterations = 50000
+        self.max_stagnant_iterations = 10000  # Stop after this many iterations without a new best
+        self.time_limit = None  # Seconds, None = bounded by iterations only
+        self.swap_rate = 0.3  # Share of proposals that swap two sections
+        self.swap_groups = []  # Per unit: units with the same room type and slot mask
+        self.initial_schedule = None  # Gene list to start from instead of a constructive seed
+
+    def solve(self):
+        """Run the search, returning (best_schedule, fitness) like evolve()"""
+        self.encoding = self.build_encoding()
+        self.stats = {'iterations': 0, 'best_iteration': 0, 'evaluations': 0, 'accepted': 0}
+        self.seed_rng()
+
+        enc = self.encoding
+        groups = {}
+        for unit in range(len(enc.units)):
+            groups.setdefault((enc.unit_room_type[unit], enc.unit_slot_mask[unit]), []).append(unit)
+        self.swap_groups = [groups[(enc.unit_room_type[unit], enc.unit_slot_mask[unit])] for unit in range(len(enc.units))]
+
+        checkpoint = self.load_checkpoint()
+        if checkpoint is not None:
+            chromosome = checkpoint['chromosome']
+        else:
+            chromosome = self.create_seed_chromosome()
+            if self.initial_schedule is not None:
+                # Sections missing from the initial schedule keep their seed placement
+                for gene in self.initial_schedule:
+                    unit = enc.unit_index.get((gene['course_id'], gene['section_code']))
+                    if unit is not None:
+                        chromosome[unit] = enc.encode([gene])[0]
+        if len(chromosome) == 0:
+            print("❌ ERROR: No course can be placed in the available rooms")
+            return None, 0
+
+        state = FitnessState(enc, chromosome)
+        best_chromosome, best_fitness = self.search(chromosome, state, checkpoint)
+        self.clear_checkpoint()
+        print(f"{type(self).__name__}: best fitness {best_fitness} after {self.stats['iterations']} iterations "
+              f"({self.stats['evaluations']} evaluations)")
+        return enc.decode(best_chromosome), best_fitness
+
+    def search(self, chromosome, state, checkpoint=None):
+        """Improve chromosome in place, returning (best chromosome, best fitness)
+
+        checkpoint is the state a previous run saved with save_checkpoint(), to
+        continue from instead of starting over.
+        """
+        raise NotImplementedError
+
+    def out_of_time(self, started):
+        return self.time_limit is not None and time.perf_counter() - started >= self.time_limit
+
+    def is_conflicted(self, state, chromosome, unit):
+        """Whether the unit takes part in a clash or mismatch"""
+        enc = self.encoding
+        code = chromosome[unit]
+        return (enc.room_types[enc.code_room[code]] != enc.unit_room_type[unit]
+                or not enc.unit_shift_mask[unit] >> enc.code_slot[code] & 1
+                or state.in_conflict(unit, code))
+
+    def pick_unit(self, state, chromosome, tries=8):
+        """Random unit, preferring one that is in conflict"""
+        n_units = len(chromosome)
+        unit = self.rng.randrange(n_units)
+        for _ in range(tries - 1):
+            if self.is_conflicted(state, chromosome, unit):
+                break
+            unit = self.rng.randrange(n_units)
+        return unit
+
+    def propose(self, state, chromosome):
+        """A neighbour as a tuple of (unit, new_code) changes"""
+        enc = self.encoding
+        unit = self.pick_unit(state, chromosome)
+        code = chromosome[unit]
+
+        if self.rng.random() < self.swap_rate:
+            other = self.rng.choice(self.swap_groups[unit])
+            if other != unit and chromosome[other] != code:
+                return (unit, chromosome[other]), (other, code)
+
+        day, slot, room = enc.code_day[code], enc.code_slot[code], enc.code_room[code]
+        move_type = self.rng.choice(['day', 'time', 'room', 'place'])
+        if move_type == 'day':
+            day = self.rng.randrange(enc.n_days)
+        elif move_type == 'time':
+            slot = self.rng.choice(enc.unit_slots[unit])
+        elif move_type == 'room':
+            room = self.rng.choice(enc.unit_rooms[unit])
+        else:
+            day = self.rng.randrange(enc.n_days)
+            slot = self.rng.choice(enc.unit_slots[unit])
+        return ((unit, enc.pack(day, slot, room)),)
+
+    def apply(self, state, chromosome, changes):
+        """Apply changes in place, returning the undo list"""
+        undo = []
+        for unit, code in changes:
+            undo.append((unit, chromosome[unit]))
+            state.move(unit, chromosome[unit], code)
+            chromosome[unit] = code
+        undo.reverse()
+        return undo
+
+    def evaluate_move(self, state, chromosome, changes):
+        """Fitness of the neighbour, leaving chromosome and state unchanged"""
+        fitness = state.score(chromosome)
+        undo = self.apply(state, chromosome, changes)
+        neighbour_fitness = state.score(chromosome)
+        self.apply(state, chromosome, undo)
+        state.fitness = fitness
+        self.stats['evaluations'] += 1
+        return neighbour_fitness
+
+
+class SimulatedAnnealingSolver(LocalSearchSolver):
+    """Simulated annealing with a geometric cooling schedule"""
+
+    def __init__(self, courses, rooms, floor_number):
+        super().__init__(courses, rooms, floor_number)
+        self.initial_temperature = 100.0  # Accepts a two-clash step with probability 1/e at the start
+        self.final_temperature = 0.1
+
+    def search(self, chromosome, state, checkpoint=None):
+        started = time.perf_counter()
+        current_fitness = state.score(chromosome)
+        cooling = (self.final_temperature / self.initial_temperature) ** (1 / max(self.max_iterations, 1))
+        if checkpoint is not None:
+            best_chromosome, best_fitness = checkpoint['best_chromosome'], checkpoint['best_fitness']
+            temperature = checkpoint['temperature']
+            stagnant = checkpoint['stagnant']
+            first_iteration = checkpoint['iteration']
+        else:
+            best_chromosome, best_fitness = chromosome[:], current_fitness
+            temperature = self.initial_temperature
+            stagnant = 0
+            first_iteration = 0
+
+        for iteration in range(first_iteration, self.max_iterations):
+            if self.checkpoint_due():
+                self.save_checkpoint({'iteration': iteration, 'chromosome': chromosome, 'best_chromosome': best_chromosome,
+                                      'best_fitness': best_fitness, 'temperature': temperature, 'stagnant': stagnant})
+            self.stats['iterations'] += 1
+            changes = self.propose(state, chromosome)
+            undo = self.apply(state, chromosome, changes)
+            fitness = state.score(chromosome)
+            self.stats['evaluations'] += 1
+
+            delta = fitness - current_fitness
+            if delta >= 0 or self.rng.random() < math.exp(delta / temperature):
+                current_fitness = fitness
+                self.stats['accepted'] += 1
+            else:
+                self.apply(state, chromosome, undo)
+                state.fitness = current_fitness
+
+            if current_fitness > best_fitness:
+                best_chromosome, best_fitness = chromosome[:], current_fitness
+                self.stats['best_iteration'] = self.stats['iterations']
+                stagnant = 0
+            else:
+                stagnant += 1
+                if stagnant >= self.max_stagnant_iterations:
+                    break
+
+            temperature *= cooling
+            if self.out_of_time(started):
+                break
+
+        return best_chromosome, best_fitness
+
+
+class TabuSearchSolver(LocalSearchSolver):
+    """Tabu search over a sampled neighbourhood
+
+    Each iteration scores neighbourhood_size proposals and takes the best one
+    that does not move a section back to a placement it left within the last
+    tabu_tenure iterations, unless it beats the best fitness found so far.
+    """
+
+    def __init__(self, courses, rooms, floor_number):
+        super().__init__(courses, rooms, floor_number)
+        self.max_iterations = 2000
+        self.max_stagnant_iterations = 300
+        self.neighbourhood_size = 40
+        self.tabu_tenure = 15
+
+    def search(self, chromosome, state, checkpoint=None):
+        started = time.perf_counter()
+        current_fitness = state.score(chromosome)
+        if checkpoint is not None:
+            best_chromosome, best_fitness = checkpoint['best_chromosome'], checkpoint['best_fitness']
+            tabu_until = checkpoint['tabu_until']
+            stagnant = checkpoint['stagnant']
+            first_iteration = checkpoint['iteration']
+        else:
+            best_chromosome, best_fitness = chromosome[:], current_fitness
+            tabu_until = {}  # {(unit, code): iteration the placement stops being tabu}
+            stagnant = 0
+            first_iteration = 0
+
+        for iteration in range(first_iteration, self.max_iterations):
+            if self.checkpoint_due():
+                self.save_checkpoint({'iteration': iteration, 'chromosome': chromosome, 'best_chromosome': best_chromosome,
+                                      'best_fitness': best_fitness, 'tabu_until': tabu_until, 'stagnant': stagnant})
+            self.stats['iterations'] += 1
+            chosen, chosen_fitness = None, None
+            for _ in range(self.neighbourhood_size):
+                changes = self.propose(state, chromosome)
+                fitness = self.evaluate_move(state, chromosome, changes)
+                if chosen_fitness is not None and fitness <= chosen_fitness:
+                    continue
+                tabu = any(tabu_until.get(change, -1) > iteration for change in changes)
+                if tabu and fitness <= best_fitness:
+                    continue
+                chosen, chosen_fitness = changes, fitness
+
+            if chosen is None:
+                stagnant += 1
+            else:
+                for unit, code in self.apply(state, chromosome, chosen):
+                    tabu_until[(unit, code)] = iteration + self.tabu_tenure
+                current_fitness = state.score(chromosome)
+                self.stats['accepted'] += 1
+
+                if current_fitness > best_fitness:
+                    best_chromosome, best_fitness = chromosome[:], current_fitness
+                    self.stats['best_iteration'] = self.stats['iterations']
+                    stagnant = 0
+                else:
+                    stagnant += 1
+            if stagnant >= self.max_stagnant_iterations or self.out_of_time(started):
+                break
+
+        return best_chromosome, best_fitness
+
+
+class SearchLimitReached(Exception):
+    """Raised inside ExactSolver when the node or time budget runs out"""
+
+
+def match_sections(demand, candidates, capacity):
+    """Bipartite b-matching of section groups to (day, slot) resources
+
+    demand[g] sections of group g each need a distinct resource out of
+    candidates[g]; resource r serves at most capacity[r] sections. Grows the
+    matching one augmenting path at a time. Returns {g: [resources]}, or None
+    when some section cannot be matched.
+    """
+    used = {g: set() for g in demand}
+    users = {r: [] for r in capacity}
+
+    for g, needed in demand.items():
+        for _ in range(needed):
+            reached_from = {}  # resource -> group that reaches it
+            released_by = {g: None}  # group -> resource it would hand over
+            queue = [g]
+            end = None
+            for h in queue:
+                for r in candidates[h]:
+                    if r in reached_from or r in used[h]:
+                        continue
+                    reached_from[r] = h
+                    if len(users[r]) < capacity[r]:
+                        end = r
+                        break
+                    for other in users[r]:
+                        if other not in released_by:
+                            released_by[other] = r
+                            queue.append(other)
+                if end is not None:
+                    break
+            if end is None:
+                return None
+
+            # Shift every group along the path onto its next resource
+            r = end
+            while r is not None:
+                h = reached_from[r]
+                used[h].add(r)
+                users[r].append(h)
+                r = released_by[h]
+                if r is not None:
+                    used[h].discard(r)
+                    users[r].remove(h)
+
+    return {g: sorted(resources) for g, resources in used.items()}
+
+
+class ExactSolver(TimetableScheduler):
+    """Exact search for a timetable without teacher or room clashes
+
+    Free slots of every room and teacher are kept as one int bitmask per day.
+    Sections with the same teacher, room type and slots are interchangeable and
+    are branched on as one group: the group with the fewest spare (day, slot)
+    options goes next (MRV) and every assignment is forward checked against the
+    groups of the same teacher and room type. Rooms that are still empty are
+    interchangeable too, so only the first one is tried.
+
+    Taking a slot also blocks every slot that overlaps it in time. A matching of
+    sections to (day, slot) pairs, with no more sections per pair than free
+    rooms of their type, is necessary for a conflict-free timetable, so when
+    none exists infeasibility is proved up front. When the backtracking search,
+    which fills rooms and days evenly, runs out of nodes or time, the matching
+    is the answer if it happens to be free of overlaps (status 'limit' if not).
+    """
+
+    def __init__(self, courses, rooms, floor_number):
+        super().__init__(courses, rooms, floor_number)
+        self.node_limit = 200000
+        self.time_limit = 2.0  # Seconds, None = bounded by node_limit only
+        self.status = None  # 'feasible', 'infeasible' or 'limit' after solve()
+
+    def solve(self):
+        """Return (best_schedule, fitness), or (None, 0) when no conflict-free schedule was found"""
+        self.encoding = enc = self.build_encoding()
+        self.stats = {'nodes': 0, 'backtracks': 0, 'search_completed': False}
+        self.seed_rng()
+        started = time.perf_counter()
+
+        self.status, chromosome = self._solve_encoded(started)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        print(f"ExactSolver: {self.status} after {self.stats['nodes']} nodes ({elapsed_ms:.0f} ms)")
+        if chromosome is None:
+            return None, 0
+        return enc.decode(chromosome), encoded_fitness(enc, chromosome)
+
+    def _solve_encoded(self, started):
+        enc = self.encoding
+        n_days, n_slots, n_rooms = enc.n_days, enc.n_slots, enc.n_rooms
+        n_units = len(enc.units)
+        if n_units == 0:
+            return 'infeasible', None
+
+        all_slots = (1 << n_slots) - 1
+        room_free = [all_slots] * (n_rooms * n_days)  # (room, day) -> free slot bits
+        teacher_free = [all_slots] * (len(enc.teacher_index) * n_days)  # (teacher, day) -> free slot bits
+        for index, blocked in enc.existing_room_blocked.items():
+            room_free[index] &= ~blocked
+        for index, blocked in enc.existing_teacher_blocked.items():
+            teacher_free[index] &= ~blocked
+        blocked_rooms = {index // n_days for index in enc.existing_room_blocked}
+
+        # Room types: slots where at least one room of the type is free
+        type_index = {}
+        unit_type = [type_index.setdefault(room_type, len(type_index)) for room_type in enc.unit_room_type]
+        type_rooms = [None] * len(type_index)
+        for unit, t in enumerate(unit_type):
+            type_rooms[t] = enc.unit_rooms[unit]
+        type_free = [0] * (len(type_index) * n_days)
+
+        def refresh_type_free(t, day):
+            free = 0
+            for room in type_rooms[t]:
+                free |= room_free[room * n_days + day]
+            type_free[t * n_days + day] = free
+
+        for t in range(len(type_index)):
+            for day in range(n_days):
+                refresh_type_free(t, day)
+
+        group_index = {}
+        groups = []  # [units, teacher, room type, slot mask]
+        for unit in range(n_units):
+            key = (enc.unit_teacher[unit], unit_type[unit], enc.unit_slot_mask[unit])
+            if key not in group_index:
+                group_index[key] = len(groups)
+                groups.append([[]] + list(key))
+            groups[group_index[key]][0].append(unit)
+
+        # Feasibility: match every section to a (day, slot) its teacher has free,
+        # with no more sections per (room type, day, slot) than free rooms
+        capacity = {}
+        candidates = {}
+        for g, (units, teacher, t, mask) in enumerate(groups):
+            candidates[g] = []
+            for day in range(n_days):
+                free = mask & teacher_free[teacher * n_days + day] & type_free[t * n_days + day]
+                while free:
+                    bit = free & -free
+                    free ^= bit
+                    resource = (t, day, bit.bit_length() - 1)
+                    if resource not in capacity:
+                        capacity[resource] = sum(1 for room in type_rooms[t] if room_free[room * n_days + day] & bit)
+                    candidates[g].append(resource)
+        matching = match_sections({g: len(units) for g, (units, _, _, _) in enumerate(groups)}, candidates, capacity)
+        if matching is None:
+            return 'infeasible', None
+
+        initial_room_free = room_free[:]  # The search leaves bitsets half-filled at its limit
+        try:
+            chromosome = self._backtrack(started, groups, room_free, teacher_free, type_rooms,
+                                         type_free, refresh_type_free, blocked_rooms)
+        except SearchLimitReached:
+            pass
+        else:
+            self.stats['search_completed'] = True
+            if chromosome is None:
+                return 'infeasible', None  # Search space exhausted
+            return 'feasible', chromosome
+
+        # Search budget exhausted: rooms for the matched slots, lowest room first.
+        # The matching does not see overlaps between different slots, so check it.
+        chromosome = array('i', bytes(4 * n_units))
+        overlap_mask = enc.slot_overlap_mask
+        room_free = initial_room_free
+        for g, resources in matching.items():
+            units, _, t, _ = groups[g]
+            for unit, (_, day, slot) in zip(units, resources):
+                for room in type_rooms[t]:
+                    if room_free[room * n_days + day] & (1 << slot):
+                        room_free[room * n_days + day] &= ~overlap_mask[slot]
+                        chromosome[unit] = enc.pack(day, slot, room)
+                        break
+                else:
+                    return 'limit', None
+        state = FitnessState(enc, chromosome)
+        if state.teacher_clashes or state.room_clashes:
+            return 'limit', None
+        return 'feasible', chromosome
+
+    def _timed_out(self, started):
+        return self.time_limit is not None and time.perf_counter() - started > self.time_limit
+
+    def _backtrack(self, started, groups, room_free, teacher_free, type_rooms, type_free,
+                   refresh_type_free, blocked_rooms):
+        """Depth-first search with MRV and forward checking
+
+        Returns the chromosome, or None when no conflict-free timetable exists,
+        and raises SearchLimitReached at the node or time limit.
+        """
+        enc = self.encoding
+        n_days, n_units = enc.n_days, len(enc.units)
+        if n_units > sys.getrecursionlimit() - 100:
+            raise SearchLimitReached  # One stack frame per section
+
+        remaining = [len(units) for units, _, _, _ in groups]
+        teacher_groups = {}
+        type_groups = {}
+        for g, (_, teacher, t, _) in enumerate(groups):
+            teacher_groups.setdefault(teacher, []).append(g)
+            type_groups.setdefault(t, []).append(g)
+
+        # Slots whose morning/evening label matches the section's shift (no shift penalty)
+        shift_slots = enc.unit_shift_mask
+
+        overlap_mask = enc.slot_overlap_mask
+        chromosome = array('i', bytes(4 * n_units))
+        room_use = [0] * enc.n_rooms
+        day_use = [0] * n_days
+
+        def options(g):
+            _, teacher, t, mask = groups[g]
+            teacher *= n_days
+            t *= n_days
+            return sum((mask & teacher_free[teacher + day] & type_free[t + day]).bit_count() for day in range(n_days))
+
+        def consistent(group_ids):
+            # Forward check: every group still has a (day, slot) for each of its sections
+            return all(remaining[g] <= options(g) for g in group_ids if remaining[g])
+
+        def values(unit, t, teacher, mask):
+            """(room, day, slot bit) choices: own-shift slots, rooms in fill order, emptiest days first"""
+            for slots in (mask & shift_slots[unit], mask & ~shift_slots[unit]):
+                tried_empty_room = False
+                for room in type_rooms[t]:
+                    if room_use[room] == 0 and room not in blocked_rooms:
+                        if tried_empty_room:
+                            continue
+                        tried_empty_room = True
+                    for day in sorted(range(n_days), key=day_use.__getitem__):
+                        free = slots & room_free[room * n_days + day] & teacher_free[teacher * n_days + day]
+                        while free:
+                            bit = free & -free
+                            free ^= bit
+                            yield room, day, bit
+
+        def search(depth):
+            if depth == n_units:
+                return True
+            self.stats['nodes'] += 1
+            if self.stats['nodes'] > self.node_limit or self._timed_out(started):
+                raise SearchLimitReached
+
+            # Most constrained group first (fewest spare options)
+            g = min((g for g in range(len(groups)) if remaining[g]), key=lambda g: options(g) - remaining[g])
+            units, teacher, t, mask = groups[g]
+            unit = units[len(units) - remaining[g]]
+            remaining[g] -= 1
+
+            for room, day, bit in values(unit, t, teacher, mask):
+                slot = bit.bit_length() - 1
+                old_room_free = room_free[room * n_days + day]
+                old_teacher_free = teacher_free[teacher * n_days + day]
+                room_free[room * n_days + day] &= ~overlap_mask[slot]
+                teacher_free[teacher * n_days + day] &= ~overlap_mask[slot]
+                room_use[room] += 1
+                day_use[day] += 1
+                old_type_free = type_free[t * n_days + day]
+                refresh_type_free(t, day)
+
+                found = False
+                if consistent(teacher_groups[teacher]) and (
+                        type_free[t * n_days + day] == old_type_free or consistent(type_groups[t])):
+                    chromosome[unit] = enc.pack(day, slot, room)
+                    found = search(depth + 1)
+
+                type_free[t * n_days + day] = old_type_free
+                day_use[day] -= 1
+                room_use[room] -= 1
+                teacher_free[teacher * n_days + day] = old_teacher_free
+                room_free[room * n_days + day] = old_room_free
+                if found:
+                    return True
+                self.stats['backtracks'] += 1
+
+            remaining[g] += 1
+            return False
+
+        return chromosome if search(0) else None
+
+
+def _solve_part(solver):
+    """Pool entry point: solve one sub-problem of a BuildingScheduler"""
+    return solver.solve()
+
+
+class BuildingScheduler(TimetableScheduler):
+    """Whole-building solve over every section and every room
+
+    Floor is just another room attribute, so a teacher's classes on different
+    floors clash like any others. Morning and evening sections never share a
+    slot (they only meet where a late morning slot overlaps an early evening
+    one), so each shift is solved as its own sub-problem by the chosen backend,
+    in parallel processes. A short tabu search on the joint model then
+    reconciles the two, resolving clashes across shifts.
+
+    With a checkpoint_path, every sub-problem and the reconcile pass checkpoint
+    to their own file next to it, and finished sub-problems are kept, so a
+    resumed solve only redoes the work that was in flight.
+    """
+
+    def __init__(self, courses, rooms, floor_number=None, backend='genetic'):
+        super().__init__(courses, rooms, floor_number)
+        self.backend = backend
+        self.processes = 2  # Sub-problems solved at once, 0 solves them one after another here
+        self.part_options = {}  # Attributes set on every sub-problem solver, e.g. {'time_limit': 60}
+        self.reconcile_iterations = 500  # Tabu iterations on the joint model, 0 only scores the merge
+        self.profiles = None  # Tuned settings for the sub-problem solvers (see load_solver_profiles)
+
+    def split_by_shift(self):
+        """{shift: sections}, for the shifts that have any"""
+        parts = {'morning': [], 'evening': []}
+        for course in self.courses:
+            is_morning = course.get('shift', '') == 'Morning' or course.get('section_code', '').startswith('MOR')
+            parts['morning' if is_morning else 'evening'].append(course)
+        return {shift: courses for shift, courses in parts.items() if courses}
+
+    def create_part_solver(self, courses, name):
+        solver = create_solver(self.backend, courses, self.rooms, self.floor_number, self.profiles)
+        solver.existing_schedules = self.existing_schedules
+        solver.teacher_busy = self.teacher_busy
+        solver.seeding = self.seeding
+        solver.seed = self.rng.getrandbits(64)  # Child stream, so parts are reproducible in any process
+        solver.workers = 0  # Parts already run in their own processes
+        solver.islands = 1
+        if self.checkpoint_path is not None:
+            solver.checkpoint_path = f'{self.checkpoint_path}.{name}'
+            solver.checkpoint_interval = self.checkpoint_interval
+        for attribute, value in self.part_options.items():
+            setattr(solver, attribute, value)
+        return solver
+
+    def solve(self):
+        """Solve the shifts, then reconcile them: (best_schedule, fitness) like evolve()"""
+        parts = self.split_by_shift()
+        self.stats = {'parts': {}}
+        self.seed_rng()
+        if self.checkpoint_path is not None:
+            self.encoding = self.build_encoding()  # Identifies the problem in checkpoints
+
+        checkpoint = self.load_checkpoint()
+        if checkpoint is not None:
+            results = checkpoint['results']
+        else:
+            solvers = [self.create_part_solver(courses, shift) for shift, courses in parts.items()]
+            print(f"Building solve: {len(self.courses)} sections, {len(self.rooms)} rooms, "
+                  f"{len(solvers)} shift sub-problems ({self.backend} backend)")
+
+            if self.processes > 0 and len(solvers) > 1:
+                context = multiprocessing.get_context(self.pool_start_method)
+                with context.Pool(min(self.processes, len(solvers))) as pool:
+                    results = pool.map(_solve_part, solvers)
+            else:
+                results = [solver.solve() for solver in solvers]
+            if self.checkpoint_path is not None:
+                self.save_checkpoint({'results': results})
+
+        merged = []
+        for shift, (schedule, fitness) in zip(parts, results):
+            self.stats['parts'][shift] = fitness
+            merged += schedule or []
+
+        # Sections a part could not place keep the joint model's seed placement
+        reconciler = TabuSearchSolver(self.courses, self.rooms, self.floor_number)
+        reconciler.existing_schedules = self.existing_schedules
+        reconciler.teacher_busy = self.teacher_busy
+        reconciler.seeding = self.seeding
+        reconciler.initial_schedule = merged
+        reconciler.seed = self.rng.getrandbits(64)
+        reconciler.max_iterations = self.reconcile_iterations
+        if self.checkpoint_path is not None:
+            reconciler.checkpoint_path = f'{self.checkpoint_path}.reconcile'
+            reconciler.checkpoint_interval = self.checkpoint_interval
+        best_schedule, fitness = reconciler.solve()
+        self.encoding = reconciler.encoding
+        self.stats['reconcile'] = reconciler.stats
+        self.clear_checkpoint()
+        return best_schedule, fitness
+
+
+SOLVER_BACKENDS = {
+    'genetic': TimetableScheduler,
+    'annealing': SimulatedAnnealingSolver,
+    'tabu': TabuSearchSolver,
+    'exact': ExactSolver,
+}
+
+
+def create_solver(backend, courses, rooms, floor_number, profiles=None):
+    """Instantiate the named backend; every backend's solve() returns (best_schedule, fitness)
+
+    profiles (see load_solver_profiles) overrides the backend's default
+    settings with the ones tuned for problems of this size.
+    """
+    if backend not in SOLVER_BACKENDS:
+        raise ValueError(f"Unknown solver backend '{backend}' (choose from {', '.join(SOLVER_BACKENDS)})")
+    solver = SOLVER_BACKENDS[backend](courses, rooms, floor_number)
+    if profiles:
+        apply_solver_profile(solver, backend, profiles)
+    return solver
+
+
+# Instance size classes for tuned profiles: (name, most sections), the last one is open-ended
+SIZE_CLASSES = (('small', 100), ('medium', 500), ('large', 2000), ('xlarge', None))
+
+
+def size_class(n_sections):
+    """Name of the size class a problem with n_sections sections falls into"""
+    for name, max_sections in SIZE_CLASSES:
+        if max_sections is None or n_sections <= max_sections:
+            return name
+
+
+def load_solver_profiles(path):
+    """Tuned settings written by tune_solver.py: {backend: {size class: {attribute: value}}}
+
+    A missing file gives {} (defaults everywhere).
+    """
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path) as profiles_file:
+        document = json.load(profiles_file)
+    return {backend: {name: profile['parameters'] for name, profile in classes.items()}
+            for backend, classes in document.get('profiles', {}).items()}
+
+
+def apply_solver_profile(solver, backend, profiles):
+    """Set the tuned attributes for the solver's backend and size class, returning the class name or None"""
+    name = size_class(len(solver.courses))
+    parameters = profiles.get(backend, {}).get(name)
+    if parameters is None:
+        return None
+    for attribute, value in parameters.items():
+        if hasattr(solver, attribute):
+            setattr(solver, attribute, value)
+    return name
+
+
+# Solver attributes that never change a solve's result, left out of ResultCache keys
+CACHE_IGNORED_ATTRIBUTES = {'seed', 'stats', 'workers', 'processes', 'pool_start_method', 'fitness_cache_size',
+                            'trace_memory', 'run_started', 'checkpoint_path', 'checkpoint_interval', 'checkpoint_saved'}
+
+
+def _canonical_documents(documents):
+    """Order-insensitive JSON of MongoDB documents (ObjectIds and dates as strings)"""
+    return sorted(json.dumps(document, sort_keys=True, default=str) for document in documents)
+
+
+class ResultCache:
+    """Solved schedules on disk, keyed by a hash of the solver's input and parameters
+
+    Entries older than max_age seconds are dropped, and past max_entries the
+    oldest go first. A solve with a given seed only matches entries solved
+    with that seed; a solve without one matches any seed, so repeating a
+    request returns the stored schedule instead of solving again.
+    """
+
+    def __init__(self, directory, max_age=7 * 24 * 3600, max_entries=100):
+        self.directory = directory
+        self.max_age = max_age
+        self.max_entries = max_entries
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, solver, seed=None):
+        """Hash of the courses, rooms, fixed classes and parameters the solver was given"""
+        parameters = {}
+        for name, value in vars(solver).items():
+            if name in CACHE_IGNORED_ATTRIBUTES:
+                continue
+            if isinstance(value, (bool, int, float, str, type(None))):
+                parameters[name] = repr(value)
+            elif isinstance(value, dict) and all(isinstance(v, (bool, int, float, str, type(None))) for v in value.values()):
+                parameters[name] = repr(sorted(value.items(), key=repr))  # part_options, teacher_busy
+        problem = {
+            'solver': type(solver).__name__,
+            'parameters': sorted(parameters.items()),
+            'seed': seed,
+            'profiles': json.dumps(getattr(solver, 'profiles', None), sort_keys=True),  # Building sub-problems
+            'courses': _canonical_documents(solver.courses),
+            'rooms': _canonical_documents(solver.rooms),
+            'existing_schedules': _canonical_documents(solver.existing_schedules),
+            'previous_schedule': _canonical_documents(solver.previous_schedule),
+        }
+        return hashlib.sha256(json.dumps(problem, sort_keys=True).encode()).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, f'{key}.result')
+
+    def get(self, key):
+        """(schedule, fitness, stats) stored under key, or None"""
+        path = self._path(key)
+        try:
+            if time.time() - os.path.getmtime(path) > self.max_age:
+                os.remove(path)
+                return None
+            with open(path, 'rb') as entry_file:
+                return pickle.loads(zlib.decompress(entry_file.read()))
+        except FileNotFoundError:
+            return None
+        except (OSError, zlib.error, pickle.UnpicklingError, EOFError) as error:
+            print(f"⚠️  Ignoring unreadable cached result {path}: {error}")
+            return None
+
+    def put(self, key, schedule, fitness, stats):
+        temporary_path = f'{self._path(key)}.tmp'
+        with open(temporary_path, 'wb') as entry_file:
+            entry_file.write(zlib.compress(pickle.dumps((schedule, fitness, stats), pickle.HIGHEST_PROTOCOL)))
+        os.replace(temporary_path, self._path(key))
+        self.evict()
+
+    def evict(self):
+        """Drop entries past max_age, then the oldest beyond max_entries"""
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith('.result'):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                entries.append((os.path.getmtime(path), path))
+            except FileNotFoundError:
+                continue  # Evicted by another worker meanwhile
+        entries.sort(reverse=True)
+        now = time.time()
+        for position, (modified, path) in enumerate(entries):
+            if position >= self.max_entries or now - modified > self.max_age:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+
+def solve_cached(solver, cache, seed=None, force=False):
+    """solver.solve(), answered from cache when the same problem was solved before
+
+    seed is the seed the caller asked for (None when the solver drew its own).
+    force solves again and replaces the stored result. A cached answer leaves
+    the stored run's stats in solver.stats, with stats['cached'] set.
+    """
+    if cache is None:
+        return solver.solve()
+
+    key = cache.key(solver, seed)
+    if not force:
+        cached = cache.get(key)
+        if cached is not None:
+            schedule, fitness, stats = cached
+            solver.stats = dict(stats, cached=True)
+            print(f"Using the cached result of an identical solve (fitness {fitness}, seed {stats.get('seed')})")
+            return schedule, fitness
+
+    schedule, fitness = solver.solve()
+    if schedule is not None:
+        cache.put(key, schedule, fitness, solver.stats)
+    return schedule, fitness
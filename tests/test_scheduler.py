@@ -0,0 +1,178 @@
+"""Solver regression checks on small synthetic floors (no MongoDB needed)"""
+import contextlib
+import io
+import pickle
+import random
+import zlib
+from array import array
+
+import pytest
+
+from scheduler import (CHECKPOINT_VERSION, DAYS_OF_WEEK, TIME_SLOTS, BatchFitnessEvaluator, FitnessState,
+                       ProblemEncoding, TimetableScheduler, encoded_fitness)
+from solvers import BuildingScheduler, ExactSolver
+
+
+def make_floor(rooms=(('101', 'Lecture Hall'), ('102', 'Lab')), sections=4):
+    """Evening lectures of one teacher each, plus string room numbers like bulk_create_rooms saves"""
+    room_documents = [{'room_number': number, 'type': room_type} for number, room_type in rooms]
+    courses = [{'_id': f'{i + 1:024x}', 'course_name': f'Course {i + 1}', 'course_type': 'Lecture',
+                'credit_hour': '3', 'shift': 'Evening', 'teacher_name': f'Teacher {i + 1}',
+                'section_code': f'EVE-{i + 1}'} for i in range(sections)]
+    return courses, room_documents
+
+
+def preserved_class(room_number, day='Monday', time_slot=('5:00 PM', '7:50 PM'), teacher='Someone Else'):
+    """A scheduled_classes document as build_scheduled_class saves it (room_number is an int)"""
+    return {'teacher_name': teacher, 'room_number': room_number, 'day': day,
+            'start_time': time_slot[0], 'end_time': time_slot[1], 'floor': 1}
+
+
+def test_preserved_class_blocks_its_room_whatever_the_room_number_type():
+    courses, rooms = make_floor()
+    for saved_number in (101, '101'):
+        encoding = ProblemEncoding(courses, rooms, existing_schedules=[preserved_class(saved_number)])
+        assert encoding.existing_room_keys
+        assert encoding.existing_room_blocked
+
+    int_rooms = [dict(room, room_number=int(room['room_number'])) for room in rooms]
+    encoding = ProblemEncoding(courses, int_rooms, existing_schedules=[preserved_class('101')])
+    assert encoding.existing_room_blocked
+
+
+def test_exact_solver_does_not_double_book_a_preserved_room():
+    # Six evenings in the only lecture hall, one of them already taken
+    courses, rooms = make_floor(sections=5)
+    solver = ExactSolver(courses, rooms, 1)
+    solver.existing_schedules = [preserved_class(101)]
+    schedule, _ = solver.solve()
+    assert solver.status == 'feasible'
+    assert all(gene['day'] != 'Monday' for gene in schedule)
+
+    courses, rooms = make_floor(sections=len(DAYS_OF_WEEK))
+    solver = ExactSolver(courses, rooms, 1)
+    solver.existing_schedules = [preserved_class(101)]
+    schedule, _ = solver.solve()
+    assert solver.status == 'infeasible'
+    assert schedule is None
+
+
+def test_building_solve_keeps_clear_of_preserved_rooms():
+    courses, rooms = make_floor(rooms=(('101', 'Lecture Hall'),), sections=5)
+    solver = BuildingScheduler(courses, [dict(room, floor=1) for room in rooms], backend='tabu')
+    solver.processes = 0
+    solver.seed = 1
+    solver.existing_schedules = [preserved_class(101)]
+    schedule, _ = solver.solve()
+    assert len(schedule) == 5
+    assert all(gene['day'] != 'Monday' for gene in schedule)
+
+
+def test_checkpoint_of_an_older_format_is_ignored(tmp_path):
+    courses, rooms = make_floor()
+    solver = TimetableScheduler(courses, rooms, 1)
+    solver.generations = 5
+    solver.checkpoint_path = str(tmp_path / 'floor-1')
+    solver.encoding = solver.build_encoding()
+    stale = {'version': CHECKPOINT_VERSION - 1, 'fingerprint': solver.checkpoint_fingerprint(),
+             'generation': 3, 'stats': {}}  # Saved before the restart counters were checkpointed
+    with open(solver.checkpoint_path, 'wb') as checkpoint_file:
+        checkpoint_file.write(zlib.compress(pickle.dumps(stale)))
+
+    schedule, _ = solver.evolve()
+    assert len(schedule) == len(courses)
+    assert solver.stats['generations'] > 0
+
+
+def random_instance(rng):
+    """Crowded floor with mixed sections, preserved classes (some in odd slots) and teachers busy elsewhere"""
+    rooms = [{'room_number': str(101 + i), 'type': room_type}
+             for i, room_type in enumerate(['Lecture Hall'] * rng.randint(1, 3) + ['Lab'] * rng.randint(1, 3))]
+    courses = []
+    for i in range(rng.randint(5, 40)):
+        is_lab = rng.random() < 0.5
+        shift = rng.choice(['Morning', 'Evening'])
+        courses.append({'_id': f'{i + 1:024x}', 'course_name': f'Course {i + 1}',
+                        'course_type': 'Lab' if is_lab else 'Lecture', 'credit_hour': '1' if is_lab else '3',
+                        'shift': shift, 'teacher_name': f'Teacher {rng.randrange(6)}',
+                        'section_code': f"{'MOR' if shift == 'Morning' else 'EVE'}-{i + 1}"})
+    time_slots = [time_slot for kinds in TIME_SLOTS.values() for slots in kinds.values() for time_slot in slots]
+    time_slots.append(('9:00 AM', '10:00 AM'))
+    existing = []
+    for _ in range(rng.randrange(15)):
+        start, end = rng.choice(time_slots)
+        existing.append({'teacher_name': f'Teacher {rng.randrange(8)}', 'day': rng.choice(DAYS_OF_WEEK),
+                         'start_time': start, 'end_time': end,
+                         'room_number': int(rng.choice(rooms)['room_number'])})
+    return courses, rooms, existing
+
+
+def test_fitness_implementations_agree():
+    np = pytest.importorskip('numpy')
+    rng = random.Random(0)
+    for _ in range(20):
+        courses, rooms, existing = random_instance(rng)
+        solver = TimetableScheduler(courses, rooms, 1)
+        solver.existing_schedules = existing
+        solver.encoding = solver.build_encoding()
+        solver.seed_rng()
+        with contextlib.redirect_stdout(io.StringIO()):
+            current = solver.encoding.decode(solver.create_seed_chromosome())
+        solver.previous_schedule = [  # Move penalties for the sections of a current timetable
+            {'course_id': gene['course_id'], 'section_code': gene['section_code'], 'day': gene['day'],
+             'start_time': gene['time_slot'][0], 'end_time': gene['time_slot'][1],
+             'room_number': int(gene['room']['room_number'])} for gene in current[::2]]
+        solver.encoding = encoding = solver.build_encoding()
+
+        population = []
+        for _ in range(10):
+            with contextlib.redirect_stdout(io.StringIO()):
+                chromosome = array('i', solver.create_seed_chromosome())
+            for _ in range(rng.randrange(8)):  # Force some clashes and mismatches
+                chromosome[rng.randrange(len(chromosome))] = rng.randrange(encoding.n_codes)
+            population.append(chromosome)
+
+            state = FitnessState(encoding, chromosome)
+            assert state.score(chromosome) == pytest.approx(encoded_fitness(encoding, chromosome))
+            for _ in range(20):
+                unit, code = rng.randrange(len(chromosome)), rng.randrange(encoding.n_codes)
+                state.move(unit, chromosome[unit], code)
+                chromosome[unit] = code
+                assert state.score(chromosome) == pytest.approx(encoded_fitness(encoding, chromosome))
+
+        batch = BatchFitnessEvaluator(solver)
+        expected = [encoded_fitness(encoding, chromosome) for chromosome in population]
+        assert np.allclose(batch.evaluate(batch.population_matrix(population)), expected)
+
+
+@pytest.mark.parametrize('fitness_mode', ['batch', 'full'])
+def test_fitness_modes_evolve_the_same_schedule(fitness_mode):
+    pytest.importorskip('numpy')
+    courses, rooms, existing = random_instance(random.Random(3))
+    results = []
+    for mode in ('incremental', fitness_mode):
+        solver = TimetableScheduler(courses, rooms, 1)
+        solver.existing_schedules = existing
+        solver.fitness_mode = mode
+        solver.generations = 10
+        solver.population_size = 30
+        solver.seed = 5
+        with contextlib.redirect_stdout(io.StringIO()):
+            schedule, fitness = solver.evolve()
+        results.append((fitness, [tuple(gene) for gene in schedule]))
+    assert results[0] == results[1]
+
+
+def test_fitness_cache_stats_only_where_the_cache_is_consulted():
+    courses, rooms, _ = random_instance(random.Random(4))
+    for mode, cached in (('incremental', False), ('full', True)):
+        solver = TimetableScheduler(courses, rooms, 1)
+        solver.fitness_mode = mode
+        solver.generations = 5
+        solver.population_size = 20
+        solver.seed = 1
+        with contextlib.redirect_stdout(io.StringIO()):
+            solver.evolve()
+        assert ('cache_hits' in solver.stats) == cached
+        assert (solver.fitness_cache is not None) == cached
+    assert solver.stats['cache_hits'] + solver.stats['cache_misses'] > 0
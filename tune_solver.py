@@ -0,0 +1,291 @@
+"""Offline tuning of the genetic algorithm's settings per problem size class
+
+Races sampled settings over a corpus of problem instances with successive
+halving: every rung runs the surviving settings on more instances and keeps
+the best 1/eta. A run is scored by its time to a schedule without conflicts
+(PAR-2: runs that never get there count as twice the time limit). The current
+defaults race in every rung, and the winner of each size class is written to a
+profiles file the app loads at startup (SCHEDULER_PROFILES, see
+solvers.load_solver_profiles) only when it beats them on the same instances.
+Instances no conflict-free timetable exists for are left out of the race.
+
+    python tune_solver.py --classes small,medium
+    python tune_solver.py --classes medium --configs 27 --instances 9 --time-limit 20
+    python tune_solver.py --corpus exported/*.json --output solver_profiles.json
+
+Corpus files hold {"courses": [...], "rooms": [...]} as the routes pass them to
+the solvers; without --corpus, synthetic institutions (benchmark.py) are used.
+"""
+import argparse
+import contextlib
+import glob
+import json
+import math
+import os
+import random
+import sys
+import time
+from datetime import datetime, timezone
+
+from benchmark import generate_institution, infeasible_by_capacity
+from scheduler import FitnessState, TimetableScheduler
+from solvers import SIZE_CLASSES, size_class
+
+# Values tried for each TimetableScheduler attribute (elite_share becomes elite_size)
+SEARCH_SPACE = {
+    'population_size': [50, 100, 200, 400],
+    'mutation_rate': [0.05, 0.1, 0.15, 0.25, 0.35],
+    'crossover_rate': [0.6, 0.75, 0.85, 0.95],
+    'elite_share': [0.02, 0.05, 0.1, 0.2],
+    'crossover_operator': ['block', 'uniform', 'single_point'],
+    'repair_attempts': [0, 5, 20],
+    'seeding': ['dsatur', 'sequential'],
+    'max_restarts': [0, 3],
+}
+
+# Synthetic corpus per size class: generate_institution() arguments, varied per instance
+SYNTHETIC_CLASSES = {
+    'small': {'floors': 1, 'sections': (50, 100)},
+    'medium': {'floors': 3, 'sections': (200, 500)},
+    'large': {'floors': 10, 'sections': (1000, 2000)},
+    'xlarge': {'floors': 20, 'sections': (3000, 5000)},
+}
+
+# Seconds per run before it counts as unsolved
+DEFAULT_TIME_LIMITS = {'small': 10, 'medium': 30, 'large': 120, 'xlarge': 300}
+
+
+class SearchFinished(Exception):
+    """Raised inside a tuning run once it has no conflicts left or is out of time"""
+
+
+class TimedScheduler(TimetableScheduler):
+    """TimetableScheduler that stops at its first conflict-free best or at time_limit
+
+    After a run, solved_after holds the seconds to the first conflict-free best
+    chromosome (None if never) and conflicts the best chromosome's remaining
+    hard conflicts, the ones ExactSolver rules out: teacher and room clashes and
+    room type mismatches. Shift mismatches are soft and do not count.
+    """
+
+    def __init__(self, courses, rooms, floor_number):
+        super().__init__(courses, rooms, floor_number)
+        self.near_perfect_share = math.inf  # Near-perfect is not conflict-free, keep going
+        self.time_limit = None
+        self.solved_after = None
+        self.conflicts = None
+
+    def evaluate_sorted(self, population):
+        fitness_scores = super().evaluate_sorted(population)
+        chromosome, state, _ = fitness_scores[0]
+        if state is None:
+            state = FitnessState(self.encoding, chromosome)
+        self.conflicts = state.teacher_clashes + state.room_clashes + state.room_mismatches
+
+        elapsed = time.perf_counter() - self.run_started
+        if self.conflicts == 0:
+            self.solved_after = elapsed
+            raise SearchFinished
+        if elapsed >= self.time_limit:
+            raise SearchFinished
+        return fitness_scores
+
+
+def sample_configurations(count, rng):
+    """The current defaults followed by count - 1 distinct random settings"""
+    defaults = TimetableScheduler([], [], None)
+    configurations = [{name: getattr(defaults, name) for name in SEARCH_SPACE if name != 'elite_share'}]
+    configurations[0]['elite_share'] = defaults.elite_size / defaults.population_size
+    seen = {json.dumps(configurations[0], sort_keys=True)}
+    for _ in range(count * 20):
+        if len(configurations) >= count:
+            break
+        configuration = {name: rng.choice(values) for name, values in SEARCH_SPACE.items()}
+        key = json.dumps(configuration, sort_keys=True)
+        if key not in seen:
+            seen.add(key)
+            configurations.append(configuration)
+    return configurations
+
+
+def solver_parameters(configuration):
+    """TimetableScheduler attributes for a configuration"""
+    parameters = dict(configuration)
+    parameters['elite_size'] = max(1, int(parameters.pop('elite_share') * parameters['population_size']))
+    return parameters
+
+
+def run_configuration(configuration, instance, time_limit, seed):
+    """Score one configuration on one instance: {'solved_after', 'conflicts', 'score'}"""
+    solver = TimedScheduler(instance['courses'], instance['rooms'], None)
+    for name, value in solver_parameters(configuration).items():
+        setattr(solver, name, value)
+    solver.time_limit = time_limit
+    solver.seed = seed
+    try:
+        solver.evolve()
+    except SearchFinished:
+        pass
+    solved = solver.solved_after is not None
+    return {
+        'solved_after': solver.solved_after,
+        'conflicts': solver.conflicts,
+        'score': solver.solved_after if solved else 2 * time_limit,
+    }
+
+
+def successive_halving(configurations, instances, time_limit, eta, seed, log):
+    """Race configurations over instances
+
+    Rung r runs the survivors on the first len(instances) / eta**(rungs - 1 - r)
+    instances (runs from earlier rungs are reused) and keeps the best 1/eta.
+    Configuration 0, the defaults, survives every rung as the baseline, so it
+    ends up scored on all instances like the winner. Returns the final
+    survivors best-first and every configuration's summary from the last rung
+    it ran in.
+    """
+    rungs = max(1, math.ceil(math.log(len(configurations), eta)))
+    results = {}  # {(configuration index, instance index): run}
+    survivors = list(range(len(configurations)))
+    summaries = {}
+
+    def summary(index, n_instances):
+        runs = [results[(index, i)] for i in range(n_instances)]
+        return {
+            'par2': sum(run['score'] for run in runs) / len(runs),
+            'solved': sum(run['solved_after'] is not None for run in runs),
+            'conflicts': sum(run['conflicts'] or 0 for run in runs) / len(runs),
+            'instances': len(runs),
+        }
+
+    for rung in range(rungs):
+        n_instances = max(1, round(len(instances) / eta ** (rungs - 1 - rung)))
+        log(f"  rung {rung + 1}/{rungs}: {len(survivors)} configurations on {n_instances} instances")
+        for index in survivors:
+            for i in range(n_instances):
+                if (index, i) not in results:
+                    results[(index, i)] = run_configuration(configurations[index], instances[i], time_limit, seed + i)
+        for index in survivors:
+            summaries[index] = summary(index, n_instances)
+        ranked = sorted(survivors, key=lambda index: (summaries[index]['par2'], summaries[index]['conflicts']))
+        survivors = ranked[:max(1, len(ranked) // eta)] if rung < rungs - 1 else ranked
+        if 0 not in survivors:
+            survivors.append(0)
+
+    return [configurations[index] for index in survivors], [summaries[index] for index in range(len(configurations))]
+
+
+def synthetic_instances(name, count, seed, log):
+    """count synthetic instances of a size class, skipping any without a conflict-free timetable"""
+    shape = SYNTHETIC_CLASSES[name]
+    rng = random.Random(seed)
+    instances = []
+    for i in range(count * 4):
+        if len(instances) >= count:
+            break
+        courses, rooms = generate_institution(
+            floors=shape['floors'], sections=rng.randint(*shape['sections']),
+            teacher_load=rng.choice([3.0, 4.0, 6.0]), morning_share=rng.choice([0.4, 0.6, 0.8]),
+            seed=seed + i)
+        instance = {'name': f'{name}-{i + 1}', 'courses': courses, 'rooms': rooms}
+        if feasible(instance, log):
+            instances.append(instance)
+    return instances
+
+
+def feasible(instance, log):
+    """Whether a conflict-free timetable can exist; no setting could solve the instance otherwise"""
+    with contextlib.redirect_stdout(sys.stderr):  # ExactSolver reports its status
+        infeasible = infeasible_by_capacity(instance['courses'], instance['rooms'])
+    if infeasible:
+        log(f"  skipping {instance['name']}: no conflict-free timetable exists")
+    return not infeasible
+
+
+def corpus_instances(patterns):
+    """{size class: [instances]} from JSON files holding courses and rooms"""
+    classes = {}
+    for pattern in patterns:
+        for path in sorted(glob.glob(pattern)):
+            with open(path) as instance_file:
+                document = json.load(instance_file)
+            instance = {'name': path, 'courses': document['courses'], 'rooms': document['rooms']}
+            classes.setdefault(size_class(len(instance['courses'])), []).append(instance)
+    return classes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--classes', default='small,medium',
+                        help=f"size classes to tune ({', '.join(name for name, _ in SIZE_CLASSES)})")
+    parser.add_argument('--corpus', nargs='+', metavar='GLOB', help='instance JSON files instead of synthetic ones')
+    parser.add_argument('--configs', type=int, default=27, help='settings sampled per size class (default 27)')
+    parser.add_argument('--instances', type=int, default=9, help='synthetic instances per size class (default 9)')
+    parser.add_argument('--eta', type=int, default=3, help='keep 1/eta of the configurations per rung (default 3)')
+    parser.add_argument('--time-limit', type=float, help='seconds per run (default depends on the size class)')
+    parser.add_argument('--seed', type=int, default=0, help='seed for sampling, instances and solver runs')
+    parser.add_argument('--output', default='solver_profiles.json', help='profiles file, updated in place')
+    args = parser.parse_args(argv)
+
+    def log(message):
+        print(message, file=sys.stderr, flush=True)
+
+    names = [name.strip() for name in args.classes.split(',') if name.strip()]
+    for name in names:
+        if name not in SYNTHETIC_CLASSES:
+            parser.error(f"unknown size class '{name}'")
+    corpus = corpus_instances(args.corpus) if args.corpus else None
+
+    try:
+        with open(args.output) as profiles_file:
+            document = json.load(profiles_file)
+    except FileNotFoundError:
+        document = {'profiles': {}}
+    profiles = document['profiles'].setdefault('genetic', {})
+
+    for name in names:
+        if corpus is not None:
+            instances = [instance for instance in corpus.get(name, []) if feasible(instance, log)]
+        else:
+            instances = synthetic_instances(name, args.instances, args.seed, log)
+        if not instances:
+            log(f"No instances in size class '{name}', skipping it")
+            continue
+        time_limit = args.time_limit or DEFAULT_TIME_LIMITS[name]
+        configurations = sample_configurations(args.configs, random.Random(args.seed))
+        log(f"Tuning '{name}': {len(configurations)} configurations, {len(instances)} instances, {time_limit}s per run")
+
+        started = time.perf_counter()
+        with open(os.devnull, 'w') as quiet, contextlib.redirect_stdout(quiet):  # The solver reports every generation
+            ranking, summaries = successive_halving(configurations, instances, time_limit, args.eta, args.seed, log)
+        best = ranking[0]
+        best_summary = summaries[configurations.index(best)]
+        defaults_summary = summaries[0]  # The defaults are always configuration 0, raced on the same instances
+        log(f"  best: {best} with PAR-2 {best_summary['par2']:.1f}s, "
+            f"{best_summary['solved']}/{best_summary['instances']} solved ({time.perf_counter() - started:.0f}s)")
+        log(f"  defaults: PAR-2 {defaults_summary['par2']:.1f}s, "
+            f"{defaults_summary['solved']}/{defaults_summary['instances']} solved")
+
+        if (best_summary['par2'], best_summary['conflicts']) >= (defaults_summary['par2'], defaults_summary['conflicts']):
+            log(f"  the defaults were not beaten, '{name}' keeps them")
+            profiles.pop(name, None)
+            continue
+        profiles[name] = {
+            'parameters': solver_parameters(best),
+            'instances': best_summary['instances'],
+            'par2_seconds': round(best_summary['par2'], 3),
+            'solved': best_summary['solved'],
+            'defaults_par2_seconds': round(defaults_summary['par2'], 3),
+            'defaults_solved': defaults_summary['solved'],
+            'time_limit': time_limit,
+            'tuned': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        }
+
+    with open(args.output, 'w') as profiles_file:
+        json.dump(document, profiles_file, indent=2)
+        profiles_file.write('\n')
+    log(f"Wrote {args.output}")
+
+
+if __name__ == '__main__':
+    main()